@@ -0,0 +1,300 @@
+"""
+Micro-benchmarks of the hot paths of the engine & of the renderer.
+
+Every benchmark times one operation (a hit test, a check of the vulture's
+moves, a move applied, a vertex redrawn...) over a fixed sample of points &
+of positions from seeded random games, so two runs time the same work. The
+best & the median seconds per operation of a few repeats are written as
+JSON, e.g.
+    python benchmarks/kaooa_bench.py --output before.json
+    python benchmarks/kaooa_bench.py --output after.json
+    python benchmarks/kaooa_bench.py --compare before.json after.json
+The comparison flags (& exits with 1 on) every benchmark slower than the
+threshold. The imports of the headless modules (the engine & the geometry
+with its hit test) are timed too, in fresh interpreters, & have to stay
+free of turtle & tkinter. The renderer needs a display: without one (e.g.
+outside of xvfb-run) its benchmarks are recorded as skipped.
+"""
+
+from pathlib import Path
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+# the game files are in the parent directory
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from kaooa_engine import (CROW, CAPTURES_TO_WIN, MOVES, NCROWS, NO_VULTURE,
+                          KaooaEngine, RandomPlayer, check_any_vmove_possible,
+                          check_jump_possible, play_game, vulture_of)
+from kaooa_geometry import VertexGrid, star_coordinates
+
+SAMPLE_GAMES = 20
+SEED = 2024
+# the modules a program without a display imports
+HEADLESS_MODULES = ('kaooa_engine', 'kaooa_geometry')
+# the size of the hit-test grid of kaooa.py
+WINDOW_SIZE = 600
+BOARD_FRACTION = 2 / 3
+
+
+def sample_games(ngames=SAMPLE_GAMES, seed=SEED):
+    """
+    the moves of a few random games, the same ones for every run
+    """
+    rng = random.Random(seed)
+    return [play_game(RandomPlayer(rng=rng), RandomPlayer(rng=rng))[1] for _ in range(ngames)]
+
+
+def sample_positions(games):
+    """
+    every position of the games where the vulture is placed
+    """
+    positions = []
+    for moves in games:
+        engine = KaooaEngine()
+        for move in moves:
+            engine.apply(move)
+            if vulture_of(engine.position) != NO_VULTURE:
+                positions.append(engine.position)
+    return positions
+
+
+def sample_points(coords, seed=SEED):
+    """
+    click points: on & around every vertex, & anywhere on the board
+    """
+    rng = random.Random(seed)
+    points = [(x + rng.uniform(-25, 25), y + rng.uniform(-25, 25))
+              for x, y in coords for _ in range(20)]
+    points += [(rng.uniform(-300, 300), rng.uniform(-300, 300)) for _ in range(200)]
+    return points
+
+
+def measure(operation, ops, repeat):
+    """
+    time a function doing ops operations per call
+
+    Returns: the best & the median seconds per operation of repeat runs
+    """
+    timer = timeit.Timer(operation)
+    number, _ = timer.autorange()
+    times = [t / number / ops for t in timer.repeat(repeat, number)]
+    return {'best': min(times), 'median': statistics.median(times), 'ops': number * ops}
+
+
+def measure_import(module, repeat):
+    """
+    time the import of a module in fresh interpreters, with its bytecode
+    cached (a first import writes it)
+
+    Returns: the best & the median seconds of 2 * repeat imports
+    Raises: RuntimeError if the module imports tkinter
+    """
+    code = ("import sys, time\n"
+            "begin = time.perf_counter()\n"
+            f"import {module}\n"
+            "print(time.perf_counter() - begin, 'tkinter' in sys.modules)")
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    times = []
+    for _ in range(2 * repeat + 1):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, check=True,
+                                capture_output=True, text=True).stdout.split()
+        if output[1] == 'True':
+            raise RuntimeError(f"importing {module} loads tkinter")
+        times.append(float(output[0]))
+    # the first import may have written the bytecode
+    times = times[1:]
+    return {'best': min(times), 'median': statistics.median(times), 'ops': len(times)}
+
+
+def engine_benchmarks():
+    """
+    Returns: the benchmarks that need no display as {name: (function, operations per call)}
+    """
+    games = sample_games()
+    positions = sample_positions(games)
+    vlocs = [(position, vulture_of(position)) for position in positions]
+    grid = VertexGrid(star_coordinates(round(WINDOW_SIZE * BOARD_FRACTION)), size=WINDOW_SIZE)
+    points = sample_points(grid.coords)
+    steps = [[MOVES[move][:2] for move in moves] for moves in games]
+
+    def hit_test():
+        vertex_at = grid.vertex_at
+        for x, y in points:
+            vertex_at(x, y)
+
+    def jump_checks():
+        for position, vloc in vlocs:
+            check_jump_possible(position, vloc)
+
+    def vmove_checks():
+        for position, vloc in vlocs:
+            check_any_vmove_possible(position, vloc)
+
+    def apply_moves():
+        # as a click does: find the legal move from src to dst & apply it
+        for game in steps:
+            engine = KaooaEngine()
+            for src, dst in game:
+                engine.apply(engine.find_move(src, dst))
+
+    return {
+        'vertex_at': (hit_test, len(points)),
+        'check_jump_possible': (jump_checks, len(vlocs)),
+        'check_any_vmove_possible': (vmove_checks, len(vlocs)),
+        'apply_move': (apply_moves, sum(map(len, steps))),
+    }
+
+
+def renderer_benchmarks(game):
+    """
+    Returns: the benchmarks drawing on the window of a game as
+    {name: (function, operations per call)}; every drawing is flushed to the canvas
+    """
+    points = [(x, y) for x, y in sample_points(game.coords)
+              if game.vertex_grid.vertex_at(x, y) is None]
+
+    def click_misses():
+        # the clicks away from the vertices are hit-tested & ignored
+        for x, y in points:
+            game.user_clicked(x, y)
+
+    def draw_erase_crow():
+        game.update_vertex(0, CROW)
+        game.flush_screen()
+        game.update_vertex(0, '')
+        game.flush_screen()
+
+    def redraw_crows_status():
+        # show every circle of the status area, then hide every one
+        game.drawn_counts = (0, 0)
+        game.show_crows_status()
+        game.flush_screen()
+        game.drawn_counts = (NCROWS, CAPTURES_TO_WIN)
+        game.show_crows_status()
+        game.flush_screen()
+
+    return {
+        'user_clicked': (click_misses, len(points)),
+        'update_vertex': (draw_erase_crow, 2),
+        'show_crows_status': (redraw_crows_status, 2),
+        'render_state': (game.render_state, 1),
+    }
+
+
+RENDERER_NAMES = ('user_clicked', 'update_vertex', 'show_crows_status', 'render_state')
+
+
+def run(groups, repeat):
+    """
+    run the benchmarks of the groups ('engine', 'renderer')
+
+    Returns: the report as a dict ready for JSON
+    """
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeat': repeat,
+        'benchmarks': {},
+        'skipped': {},
+    }
+    benchmarks = {}
+    game = None
+    if 'engine' in groups:
+        for module in HEADLESS_MODULES:
+            report['benchmarks'][f'import_{module}'] = measure_import(module, repeat)
+        benchmarks.update(engine_benchmarks())
+    if 'renderer' in groups:
+        import tkinter
+        from kaooa import Kaooa
+        try:
+            game = Kaooa()
+        except tkinter.TclError as error:
+            report['skipped'].update(dict.fromkeys(RENDERER_NAMES, f"no display: {error}"))
+        else:
+            benchmarks.update(renderer_benchmarks(game))
+
+    for name, (operation, ops) in benchmarks.items():
+        report['benchmarks'][name] = measure(operation, ops, repeat)
+    for name, result in report['benchmarks'].items():
+        print(f"{name}: {result['best'] * 1e6:.3f} us best, "
+              f"{result['median'] * 1e6:.3f} us median", file=sys.stderr)
+    for name, reason in report['skipped'].items():
+        print(f"{name}: skipped ({reason})", file=sys.stderr)
+    if game is not None:
+        game.screen.bye()
+    return report
+
+
+def compare(old, new, threshold):
+    """
+    compare the best times of two reports
+
+    Returns: the names of the benchmarks slower than old by more than the threshold
+    """
+    regressions = []
+    for name, result in new['benchmarks'].items():
+        if name not in old['benchmarks']:
+            print(f"{name}: new, {result['best'] * 1e6:.3f} us")
+            continue
+        before, after = old['benchmarks'][name]['best'], result['best']
+        change = after / before - 1
+        flag = ''
+        if change > threshold:
+            flag = ' REGRESSION'
+            regressions.append(name)
+        print(f"{name}: {before * 1e6:.3f} -> {after * 1e6:.3f} us ({change:+.1%}){flag}")
+    for name in old['benchmarks'].keys() - new['benchmarks'].keys():
+        print(f"{name}: missing from the new run")
+    return regressions
+
+
+def main():
+    """
+    run the benchmarks (or compare two runs)
+    """
+    parser = argparse.ArgumentParser(description="Time the hot paths of the Kaooa engine & renderer.")
+    parser.add_argument('--output', help="the JSON file of the timings (default: stdout)")
+    parser.add_argument('--only', choices=('engine', 'renderer'),
+                        help="run only one group of benchmarks")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="the runs of every benchmark, the best & median are kept (default: 5)")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help="compare two JSON files instead of running the benchmarks")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="the slowdown flagged as a regression (default: 0.1 for 10%%)")
+    args = parser.parse_args()
+
+    if args.compare:
+        reports = []
+        for path in args.compare:
+            with open(path, encoding='utf-8') as file:
+                reports.append(json.load(file))
+        regressions = compare(*reports, args.threshold)
+        if regressions:
+            parser.exit(1, f"{len(regressions)} regression(s) beyond {args.threshold:.0%}\n")
+        return
+
+    groups = [args.only] if args.only else ['engine', 'renderer']
+    report = run(groups, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
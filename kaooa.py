@@ -3,265 +3,192 @@ Implementation of the Kaaoa game (a.k.a Vulture vs Crows game).
 """
 
 from turtle import Turtle
-import time
-import math
-
-def find_intersection_point(p1, p2, p3, p4):
-    """
-    find the point of intersection of two lines defined by l1=(p1,p2) and l2=(p3,p4)
-
-    Args: 4 points in the (x, y) coordinates
-    Returns: the point of intersection (x, y)
-
-    Raises: ValueError if the lines are parallel
-    """
-    x1, y1 = p1
-    x2, y2 = p2
-    x3, y3 = p3
-    x4, y4 = p4
-
-    # Calculate slopes
-    if x2 - x1 != 0:
-        m1 = (y2 - y1) / (x2 - x1)
-    else:
-        m1 = float('inf')  # Parallel to y-axis
-    if x4 - x3 != 0:
-        m2 = (y4 - y3) / (x4 - x3)
-    else:
-        m2 = float('inf')  # Parallel to y-axis
-
-    # Check for parallel lines
-    if m1 == m2:
-        # Lines are parallel, no intersection
-        raise ValueError("Parallel lines has no point of intersection")
-
-    # Calculate y-intercepts
-    b1 = y1 - m1 * x1
-    b2 = y3 - m2 * x3
-
-    # Calculate intersection point
-    if m1 != float('inf') and m2 != float('inf'):
-        x_intersect = (b2 - b1) / (m1 - m2)
-    elif m1 == float('inf'):  # Line 1 is parallel to y-axis
-        x_intersect = x1
-    else:  # Line 2 is parallel to y-axis
-        x_intersect = x3
-
-    y_intersect = m1 * x_intersect + b1
-
-    return x_intersect, y_intersect
-
-def find_star_corners(side):
-    """
-    Find the coordinates of all the 5 corner vertices of a star with center at (0,0)
-    """
-    cos_18 = math.cos(math.radians(18))
-    tan_18 = math.tan(math.radians(18))
-    cos_36 = math.cos(math.radians(36))
-    sin_36 = math.sin(math.radians(36))
-
-    half_side = side/2
-    h = half_side/cos_18
-    r = half_side * tan_18
-    a = h * cos_36
-    b = h * sin_36
-
-    # vertices
-    v0 = (-half_side, r)
-    v1 = (half_side, r)
-    v2 = (-a, -b)
-    v3 = (0, h)
-    v4 = (a, -b)
-
-    return [v0, v1, v2, v3, v4]
-
-
-def get_star_coordinates(side):
-    """
-    Find the coordinates of all the 10 intersection points/vertices of a star with center at (0,0)
-    """
-    v = find_star_corners(side)
-
-    # find the inner vertices as the points of intersection of lines
-    v5 = find_intersection_point(v[1], v[2], v[0], v[4])
-    v6 = find_intersection_point(v[2], v[3], v[0], v[4])
-    v7 = find_intersection_point(v[0], v[1], v[2], v[3])
-    v8 = find_intersection_point(v[0], v[1], v[3], v[4])
-    v9 = find_intersection_point(v[1], v[2], v[3], v[4])
-
-    v += [v5, v6, v7, v8, v9]
-
-    return v
-
-
-def euclidean_distance(p1, p2):
-    """
-    Calculate the Euclidean distance between two points in 2D space.
-
-    Parameters:
-    p1 (tuple): Coordinates of the first point (x1, y1).
-    p2 (tuple): Coordinates of the second point (x2, y2).
-
-    Returns:
-    float: The Euclidean distance between the two points.
-    """
-    x1, y1 = p1
-    x2, y2 = p2
-
-    distance = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
-    return distance
+import argparse
+
+from kaooa_engine import (KaooaEngine, MOVES, MOVE_PIECE, CROW, VULTURE, NCROWS,
+                          CAPTURES_TO_WIN)
+from kaooa_geometry import VertexGrid, star_coordinates
+
+# the look of a vertex: (outline color, fill color, stretch, outline width)
+# of a circle shape of radius 10; an empty vertex is a white dot of size 18,
+# a piece is a dot of size 24 & a locked crow is purple within a blue ring
+VERTEX_LOOKS = {
+    '': ("white", "white", 0.9, 1),
+    CROW: ("blue", "blue", 1.2, 1),
+    VULTURE: ("red", "red", 1.2, 1),
+    'locked': ("blue", "purple", 1.1, 2),
+    # a crow being captured flashes for a moment
+    'captured': ("red", "orange", 1.2, 1),
+    # the legal destinations of the piece to move, brighter under the mouse
+    'target': ("green", "white", 0.9, 3),
+    'hover': ("green", "lightgreen", 1.1, 3),
+}
+
+# milliseconds before the timed events of the game: the end of a capture
+# flash, the move of the computer & the game over message
+FLASH_DELAY = 300
+AI_DELAY = 100
+GAMEOVER_DELAY = 1000
+
+# the window starts at 600x600 & the side of the star is 2/3 of the
+# smaller dimension of the window; the rest of the layout (the pieces, the
+# text & its offsets) is designed for a star of side 400 & scaled with it
+WINDOW_SIZE = 600
+MIN_WINDOW_SIZE = 300
+BOARD_FRACTION = 2 / 3
+DESIGN_SIDE = 400
 
 
 class Kaooa(Turtle):
     """
     The Game Class
     """
-    def __init__(self):
+    def __init__(self, vulture_ai=False, think_time=0.05, show_updates=False):
         super().__init__()
         self.thickness = 3
         self.bgcolor = 'lightgreen'
         # speed varies from 1-10 (slowest to fastest). 0 is instantaneous!!
         self.speed_val = 0
-        # initial positions are all empty
-        self.state = ['', '', '', '', '', '', '', '', '', '']
-        self.captured = 0
+        # the rules & the state of the game; the vulture is forced to jump
+        self.engine = KaooaEngine(forced_jump=True)
         self.gameover = False
         self.locked_vertex = -1 # unlocked
-        self.vturn = False
+
+        # the computer may play the vulture, searching within think_time seconds
+        self.vulture_player = None
+        if vulture_ai:
+            # imported here so a game between two users starts faster
+            from kaooa_search import make_vulture_ai
+            self.vulture_player = make_vulture_ai(forced_jump=True, think_time=think_time)
 
         # An empty screen is created automatically!
         self.screen.title("Kaooa Game")
-        self.screen.setup(600, 600)
+        self.screen.setup(WINDOW_SIZE, WINDOW_SIZE)
         self.screen.bgcolor(self.bgcolor)
+        # draw without showing anything until flush_screen(), once per move
+        self.screen.tracer(0)
+
+        # count the canvas updates (the flushes, as nothing else updates the
+        # canvas under tracer(0)) to check that a move causes exactly one
+        self.canvas_updates = 0
+        self.move_updates = []
+        self.show_updates = show_updates
 
         # declare extra turtles to display text
         self.text_turtle = Turtle()
         self.turn_turtle = Turtle()
-
-        # get the coordinates of the 10 vertices of the Star
-        self.coords = get_star_coordinates(400)
-
-        # the adjacency matrix of the vertices of the star
-        self.adj = [
-            [0, 0, 0, 0, 0, 0, 1, 1, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 1, 1],
-            [0, 0, 0, 0, 0, 1, 1, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 1, 1, 0],
-            [0, 0, 0, 0, 0, 1, 0, 0, 0, 1],
-            [0, 0, 1, 0, 1, 0, 1, 0, 0, 1],
-            [1, 0, 1, 0, 0, 1, 0, 1, 0, 0],
-            [1, 0, 0, 1, 0, 0, 1, 0, 1, 0],
-            [0, 1, 0, 1, 0, 0, 0, 1, 0, 1],
-            [0, 1, 0, 0, 1, 1, 0, 0, 1, 0]
-        ]
-
-        # the jump over positions (x,y) from index i -
-        # mean the vulture can jump from i to y through x.
-        self.jump = [
-            [(7,8), (6,5)],
-            [(8,7), (9,5)],
-            [(6,7), (5,9)],
-            [(7,6), (8,9)],
-            [(5,6), (9,8)],
-            [(9,1), (6,0)],
-            [(5,4), (7,3)],
-            [(6,2), (8,1)],
-            [(9,4), (7,0)],
-            [(8,3), (5,2)],
-        ]
+        self.status_turtle = Turtle()
+        for t in (self.text_turtle, self.turn_turtle, self.status_turtle):
+            t.hideturtle()
+
+        # what is drawn on the screen: the look of every vertex & the
+        # (remaining, captured) crows shown in the status area; only the
+        # differences from the state of the game are redrawn
+        self.drawn_vertices = [None] * 10
+        self.drawn_counts = None
+        # the highlighted destinations of the piece to move & the vertex under the mouse
+        self.targets = frozenset()
+        self.hovered_vertex = None
+
+        # every vertex is a circle-shaped turtle whose color is changed in
+        # place, so the canvas keeps the same items however long the game
+        self.vertex_turtles = [self.make_circle_turtle() for _ in range(10)]
+        # as are the crow circles of the status area, shown or hidden
+        self.status_slots = []
+        for nslots in (NCROWS, CAPTURES_TO_WIN):
+            self.status_slots.append([])
+            for _ in range(nslots):
+                t = self.make_circle_turtle()
+                t.color("black", "blue")
+                t.hideturtle()
+                self.status_slots[-1].append(t)
+        # the message shown when the game is over
+        self.gameover_message = None
+
+        # place everything for the size of the window
+        self.board_size = None
+        self.layout(WINDOW_SIZE)
 
         # render the initial state
         self.render_state()
         self.play_game()
 
-    def color_dot_white(self, point):
-        """
-        Function to draw a dot
-        """
-        # draw an white circles at coords of 'point'
-        self.pen(pencolor="white", fillcolor="white", pensize=1, speed=self.speed_val)
-        self.penup()
-        self.goto(point)
-        self.pendown()
-        self.dot(18)
-
-    def color_dot_blue(self, point):
-        """
-        Function to draw a dot
-        """
-        # blue color to represent a crow
-        self.pen(pencolor="blue", pensize=1, speed=self.speed_val)
-        self.penup()
-        self.goto(point)
-        self.pendown()
-        self.dot(24)
-
-    def color_dot_red(self, point):
-        """
-        Function to draw a dot
-        """
-        # red color to represent a vulture
-        self.pen(pencolor="red", pensize=1, speed=self.speed_val)
-        self.penup()
-        self.goto(point)
-        self.pendown()
-        self.dot(24)
-
-    def lock_crow_dot(self):
-        """
-        Function to draw a dot
-        """
-        point = self.coords[self.locked_vertex]
-        # violet color to represent a locked crow
-        self.pen(pencolor="purple", pensize=1, speed=self.speed_val)
-        self.penup()
-        self.goto(point)
-        self.pendown()
-        self.dot(22)
-
-    def unlock_crow_dot(self):
+    def make_circle_turtle(self):
         """
-        Function to draw a dot
+        create a circle-shaped turtle to show a vertex or a crow at the text area
         """
-        point = self.coords[self.locked_vertex]
-        self.color_dot_blue(point)
-
-    def place_circle_text(self, point):
-        """paint a dot with blue color to represent a crow at the text area"""
-        self.text_turtle.pen(fillcolor="blue", pensize=1, speed=self.speed_val)
-        self.text_turtle.penup()
-        self.text_turtle.goto(point)
-        self.text_turtle.pendown()
-        self.text_turtle.begin_fill()
-        self.text_turtle.circle(10)
-        self.text_turtle.end_fill()
+        t = Turtle(shape="circle")
+        t.speed(self.speed_val)
+        t.penup()
+        return t
 
-    def erase_dot(self, point):
+    def layout(self, size):
         """
-        Function to draw a dot with background color
+        compute the positions of everything for a window whose smaller dimension is size
+        (& move the turtles there); nothing else computes a position
         """
-        # first replace the dot with the background color
-        self.pen(pencolor=self.bgcolor, pensize=1, speed=self.speed_val)
-        self.penup()
-        self.goto(point)
-        self.pendown()
-        self.dot(24)
-        # place a white dot
-        self.color_dot_white(point)
+        self.board_size = size
+        side = round(size * BOARD_FRACTION)
+        scale = side / DESIGN_SIDE
+        self.scale = scale
+        # get the coordinates of the 10 vertices of the Star
+        self.coords = star_coordinates(side)
+        # the clicks near a vertex (within 20 pixels, scaled) select it
+        self.vertex_grid = VertexGrid(self.coords, radius=20 * scale, size=size)
+
+        # the text panels, below the star & above its right side
+        x2, y2 = self.coords[2]
+        x3, y3 = self.coords[3]
+        self.gameover_point = (x2 + 180 * scale, y2 - 70 * scale)
+        self.turn_point = (x3 + 250 * scale, y3 + 60 * scale)
+        self.status_label_points = [(x2, y2 - (50 + 50 * row) * scale) for row in range(2)]
+        self.fonts = {name: ("Arial", max(6, round(points * scale)), "normal")
+                      for name, points in (('gameover', 28), ('status', 14), ('turn', 11))}
+
+        for vertex, t in enumerate(self.vertex_turtles):
+            t.goto(self.coords[vertex])
+        for row, slots in enumerate(self.status_slots):
+            for slot, t in enumerate(slots):
+                t.goto(self.crows_status_slot(row, slot))
+                t.shapesize(scale, scale, 1)
+        # the vertices are sized again when they're drawn
+        self.drawn_vertices = [None] * 10
+
+    def window_resized(self, event):
+        """
+        The window resize handler: lay the board out for the new size & redraw it
+        """
+        size = max(MIN_WINDOW_SIZE, min(event.width, event.height))
+        if size == self.board_size:
+            return
+        # grow the drawing area with the window
+        self.screen.screensize(event.width, event.height)
+        self.layout(size)
+        self.draw_board()
+        for vertex in range(10):
+            self.update_vertex(vertex)
+        self.show_turn_info()
+        if self.gameover_message is not None:
+            # shown & flushed in place of the crows status
+            self.show_gameover_status(self.gameover_message)
+            return
+        self.clear_crows_status()
+        self.show_crows_status()
+        self.flush_screen()
 
     def show_gameover_status(self, message=""):
         """show a text message in the texta area"""
-        # reset the turtle
+        self.gameover_message = message
+        # reset the turtle & the crows status area it replaces
+        self.clear_crows_status()
         self.text_turtle.clear()
         self.text_turtle.hideturtle()  # Hide the turtle icon
-        pos = self.coords[2]
-        # change y position
-        pos = (pos[0]+180, pos[1]-70)
         self.text_turtle.penup()
-        self.text_turtle.goto(pos)
+        self.text_turtle.goto(self.gameover_point)
         self.text_turtle.pendown()
         # Print the Text
-        self.text_turtle.write(message, move=True, font=("Arial", 28, "normal"), align="center")
+        self.text_turtle.write(message, move=True, font=self.fonts['gameover'], align="center")
+        self.flush_screen()
 
     def show_turn_info(self):
         """show whose turn is next"""
@@ -269,68 +196,138 @@ class Kaooa(Turtle):
         # reset the turtle to clear the text area
         t.clear()
         t.hideturtle()  # Hide the turtle icon
-        pos = self.coords[3]
-        # change y position
-        pos = (pos[0]+250, pos[1]+60)
         t.penup()
-        t.goto(pos)
+        t.goto(self.turn_point)
         t.pendown()
         # Print the Text
         text_to_display = "Turn: "
-        text_to_display += "vulture" if self.vturn else "crows"
-        t.write(text_to_display, move=False, font=("Arial", 11, "normal"), align="right")
+        text_to_display += "vulture" if self.engine.vturn else "crows"
+        t.write(text_to_display, move=False, font=self.fonts['turn'], align="right")
 
-    def set_vturn(self, status):
+    def crows_status_slot(self, row, slot):
         """
-        set vulture's turn to the input boolean value
+        the center of a crow circle in the status area; row 0 shows the
+        remaining crows & row 1 the captured ones
         """
-        self.vturn = status
-        # re-render the turn info area
-        self.show_turn_info()
+        pos = self.coords[2]
+        return (pos[0] + (50 + 30 * (slot + 1)) * self.scale,
+                pos[1] - (40 + 50 * row) * self.scale)
+
+    def clear_crows_status(self):
+        """remove the labels & the circles of the crows status area"""
+        self.status_turtle.clear()
+        for row in self.status_slots:
+            for t in row:
+                t.hideturtle()
+        self.drawn_counts = None
 
     def show_crows_status(self):
-        """show the remaining crows number graphically"""
-        t = self.text_turtle
-        # reset the turtle
-        t.clear()
-        t.hideturtle()  # Hide the turtle icon
-        pos = self.coords[2]
-        # change y position
-        pos = (pos[0], pos[1]-50)
-        t.penup()
-        t.goto(pos)
-        t.pendown()
-        # Print the Text
-        t.write("Crows:", move=True, font=("Arial", 14, "normal"), align="left")
-        pos = (pos[0]+50, pos[1])
-        # show a blue circle for each crow
-        ncrows_placed = sum(1 for x in self.state if x == 'crow') + self.captured
-        ncrows_remaining = 7 - ncrows_placed
-        for _ in range(ncrows_remaining):
-            # position slightly to the right
-            pos = (pos[0]+30, pos[1])
-            self.place_circle_text(pos)
-
-        # Show captured crows in the next line
-        pos = self.coords[2]
-        pos = (pos[0], pos[1]-100)
-        t.penup()
-        t.goto(pos)
-        t.pendown()
-        # Print the Text
-        t.write("Captured:", move=True, font=("Arial", 14, "normal"), align="left")
-        pos = (pos[0]+50, pos[1])
-        # show a blue circle for each crow
-        for _ in range(self.captured):
-            # position slightly to the right
-            pos = (pos[0]+30, pos[1])
-            self.place_circle_text(pos)
+        """show the remaining & captured crows graphically, redrawing only the changed circles"""
+        counts = (self.engine.crows_in_hand(), self.engine.captured)
+        if self.drawn_counts is None:
+            # write the labels once
+            t = self.status_turtle
+            t.hideturtle()  # Hide the turtle icon
+            for pos, label in zip(self.status_label_points, ("Crows:", "Captured:")):
+                t.penup()
+                t.goto(pos)
+                t.pendown()
+                # Print the Text
+                t.write(label, move=True, font=self.fonts['status'], align="left")
+            self.drawn_counts = (0, 0)
+
+        for row in range(2):
+            drawn, count = self.drawn_counts[row], counts[row]
+            # show a blue circle for each crow; hide the ones gone
+            for slot in range(count, drawn):
+                self.status_slots[row][slot].hideturtle()
+            for slot in range(drawn, count):
+                self.status_slots[row][slot].showturtle()
+        self.drawn_counts = counts
+
+    def vertex_look(self, vertex):
+        """
+        what should be drawn on a vertex: a crow, a locked crow, the vulture or nothing
+        """
+        if vertex == self.locked_vertex:
+            return 'locked'
+        if self.engine.position >> vertex & 1:
+            return CROW
+        if vertex == self.engine.vulture_vertex():
+            return VULTURE
+        if vertex in self.targets:
+            return 'hover' if vertex == self.hovered_vertex else 'target'
+        return ''
+
+    def find_targets(self):
+        """
+        the legal destinations of the locked crow or of the user's vulture
+        (only the jumps when the vulture has to jump)
+        """
+        if self.engine.vturn:
+            if self.vulture_player is not None:
+                return frozenset()
+            src = self.engine.vulture_vertex()
+        else:
+            src = self.locked_vertex
+        if src < 0:
+            # nothing to highlight for the placements
+            return frozenset()
+        # the engine generates the moves once per position
+        return frozenset(MOVES[move][1] for move in self.engine.legal_moves()
+                         if MOVES[move][0] == src)
 
+    def update_targets(self):
+        """
+        highlight the destinations of the piece to move after a change of the
+        position or of the locked crow
+        """
+        targets = self.find_targets()
+        if targets == self.targets:
+            return
+        changed = targets ^ self.targets
+        self.targets = targets
+        for vertex in changed:
+            self.update_vertex(vertex)
 
-    def render_state(self):
-        """re-render the state everytime"""
-        self.reset()
+    def mouse_moved(self, event):
+        """
+        The mouse motion handler: brighten a highlighted destination under the mouse
+        """
+        cv = self.screen.getcanvas()
+        x = cv.canvasx(event.x) / self.screen.xscale
+        y = -cv.canvasy(event.y) / self.screen.yscale
+        vertex = self.vertex_grid.vertex_at(x, y)
+        if vertex == self.hovered_vertex:
+            return
+        hovered = (self.hovered_vertex, vertex)
+        self.hovered_vertex = vertex
+        # only the targets change their look
+        if any(v in self.targets for v in hovered):
+            for v in hovered:
+                if v in self.targets:
+                    self.update_vertex(v)
+            self.flush_screen()
+
+    def update_vertex(self, vertex, look=None):
+        """
+        redraw a vertex only if its look (by default, what's on it) has changed
+        """
+        if look is None:
+            look = self.vertex_look(vertex)
+        if self.drawn_vertices[vertex] == look:
+            return
+        pencolor, fillcolor, stretch, outline = VERTEX_LOOKS[look]
+        t = self.vertex_turtles[vertex]
+        t.color(pencolor, fillcolor)
+        t.shapesize(stretch * self.scale, stretch * self.scale, outline)
+        self.drawn_vertices[vertex] = look
 
+    def draw_board(self):
+        """
+        draw the lines of the star, the background layer of the board
+        """
+        self.clear()
         # Set the speed 1-10 (0 is instantaneous)
         self.speed(self.speed_val)
 
@@ -345,161 +342,203 @@ class Kaooa(Turtle):
             self.goto(vertex)
         self.goto(self.coords[0])  # Connect back to the first vertex
 
-        # draw circles
-        # set thickness of the lines to small
-        for i in range(10):
-            if self.state[i] == 'crow':
-                self.color_dot_blue(self.coords[i])
+    def render_state(self):
+        """
+        draw the star once as the background & everything on it;
+        later changes only redraw what they touch
+        """
+        self.reset()
+        self.draw_board()
 
-            elif self.state[i] == 'vulture':
-                self.color_dot_red(self.coords[i])
-            else:
-                self.color_dot_white(self.coords[i])
+        # color the circles
+        self.drawn_vertices = [None] * 10
+        for i in range(10):
+            self.update_vertex(i)
 
+        self.clear_crows_status()
         self.show_crows_status()
+        self.flush_screen()
 
-    def move_vulture(self, prev_vertex, new_vertex):
+    def flush_screen(self):
         """
-        move the vulture from prev_vertex to the new_vertex
+        show everything drawn since the last flush in one canvas update
         """
-        self.state[prev_vertex] = ''
-        self.erase_dot(self.coords[prev_vertex])
-        self.state[new_vertex] = 'vulture'
-        self.color_dot_red(self.coords[new_vertex])
-        # change turns
-        self.set_vturn(False)
+        self.canvas_updates += 1
+        self.screen.update()
 
-    def check_any_vmove_possible(self, vloc):
+    def schedule(self, delay, action):
         """
-        check if any move possible for the vulture at location vloc
+        run an action after a delay in milliseconds, without blocking the
+        event loop meanwhile
         """
-        # check if any nearby move possible
-        for loc, val in enumerate(self.adj[vloc]):
-            if val and self.state[loc] == '':
-                return True
-
-        # check for any jump-over locations possible
-        for _, target in self.jump[vloc]:
-            if self.state[target] == '':
-                return True
+        self.screen.ontimer(action, delay)
 
-        return False
-
-    def capture_crow(self, crow_vertex):
+    def play_move(self, move):
         """
-        Function to change state after capturing a crow.
+        play a legal move on the engine & repaint only the vertices it touched
         """
-        self.state[crow_vertex] = ''
-        self.erase_dot(self.coords[crow_vertex])
-        self.captured += 1
-        # set crows turn
-        self.set_vturn(False)
-        # re-render the crow status area
+        # count the canvas updates of the whole move
+        updates = self.canvas_updates
+        self.engine.apply(move)
+        # the source, the destination & any captured crow
+        for vertex in MOVES[move]:
+            if vertex >= 0:
+                self.update_vertex(vertex)
+        captured_vertex = MOVES[move][2]
+        if captured_vertex >= 0:
+            # flash the captured crow before it disappears
+            self.update_vertex(captured_vertex, 'captured')
+            self.schedule(FLASH_DELAY, lambda: self.end_flash(captured_vertex))
+        self.update_targets()
+        # change turns
+        self.show_turn_info()
+        # re-render the crow status area (only if a crow is placed or captured)
         self.show_crows_status()
+        # show the whole move at once
+        self.flush_screen()
+        self.move_updates.append(self.canvas_updates - updates)
+        if self.show_updates:
+            print(f"move {len(self.engine.history)}: {self.move_updates[-1]} canvas update(s)")
+        self.check_gameover()
+        self.vulture_ai_turn()
 
-        if self.captured >= 4:
-            # Game Over!
-            time.sleep(1)
-            self.show_gameover_status("Vulture Won the Game!")
-            self.gameover = True
-            # Exit the game!
-            # self.screen.bye()
-            return
+    def end_flash(self, vertex):
+        """
+        show what's on a flashed vertex again
+        """
+        self.update_vertex(vertex)
+        self.flush_screen()
 
-    def check_vulture_jumping_over(self, prev_vertex, selected_vertex):
-        """check if vulture is jumping over a crow"""
-        for middle, target in self.jump[prev_vertex]:
-            # the middle vertex should have a crow to jump-over
-            if selected_vertex != target or self.state[middle] != 'crow':
-                continue
-            # else jump the vulture
-            self.move_vulture(prev_vertex, selected_vertex)
-            # capture the crow
-            self.capture_crow(middle)
+    def vulture_ai_turn(self):
+        """
+        let the computer move the vulture if it plays the vulture & it's its turn
+        """
+        if self.vulture_player is None or self.gameover or not self.engine.vturn:
+            return
+        # move a moment later, after the crows' move is shown
+        self.schedule(AI_DELAY, self.play_vulture_ai)
 
-    def check_jump_possible(self, prev_vertex):
+    def play_vulture_ai(self):
         """
-        check if a jump is possible from prev_vertex of the vulture
+        the computer's move of the vulture
         """
-        for middle, target in self.jump[prev_vertex]:
-            if self.state[middle] == 'crow' and self.state[target] == '':
-                return True
-        return False
+        if self.gameover or not self.engine.vturn:
+            return
+        # the search respects the compulsory jumps & answers within its time budget
+        self.play_move(self.vulture_player.choose_move(self.engine.position))
 
-    def vulture_turn(self, selected_vertex):
+    def check_gameover(self):
         """
-        Vulture's turn to play
+        check if the vulture is trapped by the crows or has captured enough crows
         """
-        # check if it's the first move of the user
-        if 'vulture' not in self.state:
-            self.state[selected_vertex] = 'vulture'
-            self.color_dot_red(self.coords[selected_vertex])
-            # change turns
-            self.set_vturn(False)
+        winner = self.engine.winner()
+        if winner is None:
             return
 
-        prev_vertex = self.state.index('vulture')
-        # the clicked location has to be either nearby or a jump-over location
-        # check if clicking on a nearby vertex
-        if self.adj[prev_vertex][selected_vertex]:
-            # make sure no compulsory jumping
-            if not self.check_jump_possible(prev_vertex):
-                self.move_vulture(prev_vertex, selected_vertex)
-                return
+        # Game Over! (no more clicks) & the message a moment later
+        self.gameover = True
+        self.schedule(GAMEOVER_DELAY, self.show_winner)
+        # Exit the game!
+        # self.screen.bye()
 
-        self.check_vulture_jumping_over(prev_vertex, selected_vertex)
+    def show_winner(self):
+        """
+        show who won, unless the end of the game has been undone meanwhile
+        """
+        winner = self.engine.winner()
+        if not self.gameover or winner is None:
+            return
+        if winner == 'vulture':
+            self.show_gameover_status("Vulture Won the Game!")
+        else:
+            self.show_gameover_status("Crows Won the Game!")
 
-    def check_vulture_trapped(self):
+    def undo_move(self):
         """
-        check if the vulture is trapped by the crows
+        The undo key handler: take back the last move (& the user's move before
+        the computer's reply), repainting only the vertices they touched
         """
-        # initial state; no trapping obviously!
-        if 'vulture' not in self.state:
+        if not self.engine.history:
             return
+        touched = self.take_back()
+        if self.vulture_player is not None and self.engine.vturn and self.engine.history:
+            touched |= self.take_back()
+        self.show_changes(touched)
 
-        # if all adjacent vertices are occupied by crows & no jumpover as well
-        vloc = self.state.index('vulture')
-        if not self.check_any_vmove_possible(vloc):
-            # Game Over!
-            time.sleep(1)
-            self.show_gameover_status("Crows Won the Game!")
-            self.gameover = True
-            # Exit the game!
-            # self.screen.bye()
+    def redo_move(self):
+        """
+        The redo key handler: play again the last move taken back (& the
+        computer's reply that followed it)
+        """
+        if not self.engine.undone:
             return
+        touched = self.play_again()
+        if self.vulture_player is not None and self.engine.vturn and self.engine.undone:
+            touched |= self.play_again()
+        self.show_changes(touched)
+        self.vulture_ai_turn()
 
-    def place_another_crow(self, selected_vertex):
+    def take_back(self):
         """
-        place a crow in an empty location
+        undo a move on the engine
+
+        Returns: the vertices to repaint
         """
-        # place the crow on the selected vertex
-        self.state[selected_vertex] = 'crow'
-        self.color_dot_blue(self.coords[selected_vertex])
-        # set vulture turn!
-        self.set_vturn(True)
-        # re-render the crow status area
-        self.show_crows_status()
-        self.check_vulture_trapped()
+        move = self.engine.undo()
+        unlocked_vertex = self.locked_vertex
+        # a crow was locked before it moved
+        src = MOVES[move][0]
+        self.locked_vertex = src if MOVE_PIECE[move] == CROW else -1
+        return {vertex for vertex in MOVES[move] + (unlocked_vertex,) if vertex >= 0}
 
-    def lock_crow_vertex(self, selected_vertex):
-        """unlock any previously locked vertex"""
-        if self.locked_vertex != -1:
-            self.unlock_crow_dot()
+    def play_again(self):
+        """
+        redo a move on the engine
 
-        self.locked_vertex = selected_vertex
-        self.lock_crow_dot()
+        Returns: the vertices to repaint
+        """
+        move = self.engine.redo()
+        unlocked_vertex = self.locked_vertex
+        self.locked_vertex = -1
+        return {vertex for vertex in MOVES[move] + (unlocked_vertex,) if vertex >= 0}
 
-    def move_a_crow(self, prev_vertex, new_vertex):
+    def show_changes(self, touched):
         """
-        move a crow from the prev_vertex to the new_vertex
+        repaint the touched vertices & the rest of the game after an undo or a redo
         """
-        self.state[prev_vertex] = ''
-        self.erase_dot(self.coords[prev_vertex])
-        self.state[new_vertex] = 'crow'
-        self.color_dot_blue(self.coords[new_vertex])
-        # change turns
-        self.set_vturn(True)
-        self.check_vulture_trapped()
+        self.gameover = False
+        if self.gameover_message is not None:
+            # the game goes on
+            self.gameover_message = None
+            self.text_turtle.clear()
+        for vertex in touched:
+            self.update_vertex(vertex)
+        self.update_targets()
+        self.show_turn_info()
+        self.show_crows_status()
+        self.flush_screen()
+        self.check_gameover()
+
+    def vulture_turn(self, selected_vertex):
+        """
+        Vulture's turn to play
+        """
+        # the clicked location has to be either nearby or a jump-over location
+        # (or anywhere if it's the first move of the user); the engine makes
+        # sure there is no compulsory jumping
+        move = self.engine.find_move(self.engine.vulture_vertex(), selected_vertex)
+        if move is not None:
+            self.play_move(move)
+
+    def lock_crow_vertex(self, selected_vertex):
+        """unlock any previously locked vertex"""
+        unlocked_vertex = self.locked_vertex
+        self.locked_vertex = selected_vertex
+        if unlocked_vertex != -1:
+            self.update_vertex(unlocked_vertex)
+        self.update_vertex(selected_vertex)
+        self.update_targets()
+        self.flush_screen()
 
     def move_an_existing_crow(self, selected_vertex):
         """
@@ -508,33 +547,32 @@ class Kaooa(Turtle):
         # if a crow vertex is not locked already
         if self.locked_vertex < 0:
             # ignore clicking on an empty location
-            if self.state[selected_vertex] != 'crow':
+            if self.engine.state[selected_vertex] != CROW:
                 return
             # else lock the clicked (crow) vertex
             self.lock_crow_vertex(selected_vertex)
 
-        elif self.state[selected_vertex] == 'crow':
+        elif self.engine.state[selected_vertex] == CROW:
             # change the lock to the clicked (crow) vertex
             self.lock_crow_vertex(selected_vertex)
         else:
             # move only if the selected vertex is adjacent to the locked vertex
-            if self.adj[self.locked_vertex][selected_vertex]:
-                self.move_a_crow(self.locked_vertex, selected_vertex)
+            move = self.engine.find_move(self.locked_vertex, selected_vertex)
+            if move is not None:
                 # remove any lock
                 self.locked_vertex = -1
+                self.play_move(move)
 
 
     def crows_turn(self, selected_vertex):
         """
         let the crows make a move; two possibilities (place/move)
         """
-        # count how many crows are already placed on the board
-        ncrows_placed = sum(1 for x in self.state if x == 'crow') + self.captured
-        if ncrows_placed < 7:
+        if self.engine.crows_in_hand() > 0:
             # ignore clicking on a crow location again
-            if self.state[selected_vertex] == 'crow':
-                return
-            self.place_another_crow(selected_vertex)
+            move = self.engine.find_move(-1, selected_vertex)
+            if move is not None:
+                self.play_move(move)
         else:
             self.move_an_existing_crow(selected_vertex)
 
@@ -547,21 +585,22 @@ class Kaooa(Turtle):
         if self.gameover:
             return
 
-        # find the nearest vertex to the clicked position
-        dists = [euclidean_distance((x,y), c) for c in self.coords]
-        nearest_vertex = dists.index(min(dists))
         # the clicked position should be reasonably close to one of the vertices
-        if min(dists) > 20:
+        nearest_vertex = self.vertex_grid.vertex_at(x, y)
+        if nearest_vertex is None:
             return
 
-        if self.vturn:
+        if self.engine.vturn:
+            # the computer may be playing the vulture
+            if self.vulture_player is not None:
+                return
             # the clicked vertex should be empty
-            if self.state[nearest_vertex] != '':
+            if self.engine.state[nearest_vertex] != '':
                 return
             self.vulture_turn(nearest_vertex)
         else:
             # ignore clicking on vulture location
-            if self.state[nearest_vertex] == 'vulture':
+            if self.engine.state[nearest_vertex] == VULTURE:
                 return
             self.crows_turn(nearest_vertex)
 
@@ -572,12 +611,38 @@ class Kaooa(Turtle):
         The user plays vulture & the system plays the crows.
         """
         # crows start the game
-        self.set_vturn(False)
+        self.show_turn_info()
+        self.flush_screen()
         # listener for user clicks on an empty circle's vicinity
         self.screen.onclick(self.user_clicked)
+        # & for the mouse moving over the highlighted destinations
+        self.screen.getcanvas().bind("<Motion>", self.mouse_moved)
+        # & for the window being resized
+        self.screen.getcanvas().bind("<Configure>", self.window_resized, add="+")
+        # & for the undo/redo keys
+        self.screen.onkey(self.undo_move, "u")
+        self.screen.onkey(self.redo_move, "r")
+        self.screen.listen()
         # print("Game ended!")
 
 
-
-game = Kaooa()
-input("Press Enter to Quit. ")
+def main():
+    """
+    open the game window & wait for the user to quit
+    """
+    parser = argparse.ArgumentParser(description="Kaooa game (a.k.a Vulture vs Crows game).")
+    parser.add_argument('--vulture-ai', action='store_true',
+                        help="the computer plays the vulture")
+    parser.add_argument('--think-time', type=int, default=50,
+                        help="milliseconds the computer thinks about a move (default: 50)")
+    parser.add_argument('--show-updates', action='store_true',
+                        help="print the number of canvas updates caused by every move")
+    args = parser.parse_args()
+
+    Kaooa(vulture_ai=args.vulture_ai, think_time=args.think_time / 1000,
+          show_updates=args.show_updates)
+    input("Press Enter to Quit. ")
+
+
+if __name__ == '__main__':
+    main()
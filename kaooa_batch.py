@@ -0,0 +1,306 @@
+"""
+A vectorized simulator advancing a batch of Kaooa games in lock-step (requires NumPy).
+
+The crows, vulture, hand & captured count of every game are kept in NumPy
+arrays, and the legal moves of all the games come from array lookups in the
+neighbor & jump mask tables of kaooa_tables. A policy picks the moves of all
+the games of a batch at once, so random play & simple heuristics are a few
+array operations per ply whatever the number of games.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from kaooa_engine import (ALL_VERTICES, VULTURE_SHIFT, HAND_SHIFT, CAPTURED_SHIFT,
+                          VTURN, NO_VULTURE, CAPTURES_TO_WIN, MAX_PLIES, VULTURE_BIT,
+                          INITIAL_POSITION)
+from kaooa_tables import NEIGHBOR_MASK, JUMP
+
+
+def _build_tables():
+    """
+    the tables of the moves as arrays; those indexed by the vertex of the
+    vulture have an extra last row for NO_VULTURE
+    """
+    neighbors = np.array(NEIGHBOR_MASK + (0,), dtype=np.int64)
+    vulture_bit = np.array(VULTURE_BIT[:NO_VULTURE + 1], dtype=np.int64)
+    jump_middle = np.array([[1 << m for m, _ in row] for row in JUMP] + [[0, 0]], dtype=np.int64)
+    jump_target = np.array([[1 << t for _, t in row] for row in JUMP] + [[0, 0]], dtype=np.int64)
+    # the vertex jumped over from a vertex to a target vertex
+    jump_over = np.zeros((NO_VULTURE + 1, 10), dtype=np.int64)
+    for v, row in enumerate(JUMP):
+        for middle, target in row:
+            jump_over[v, target] = middle
+    # the number of set bits & the index of the n-th set bit of every 10-bit mask
+    popcount = np.array([bin(m).count('1') for m in range(ALL_VERTICES + 1)], dtype=np.int64)
+    nth_bit = np.zeros((ALL_VERTICES + 1, 10), dtype=np.int64)
+    for mask in range(ALL_VERTICES + 1):
+        for n, v in enumerate(v for v in range(10) if mask >> v & 1):
+            nth_bit[mask, n] = v
+    return neighbors, vulture_bit, jump_middle, jump_target, jump_over, popcount, nth_bit
+
+
+(NEIGHBORS_NP, VULTURE_BIT_NP, JUMP_MIDDLE_NP, JUMP_TARGET_NP, JUMP_OVER_NP,
+ POPCOUNT_NP, NTH_BIT_NP) = _build_tables()
+
+VERTICES_NP = np.arange(10)
+
+# the result of a game: still going on (or a draw), won by the crows or by the vulture
+NO_RESULT = 0
+CROWS_WON = 1
+VULTURE_WON = -1
+
+
+def random_bit(masks, rng):
+    """
+    the index of a uniformly random set bit of every mask (0 for an empty mask)
+    """
+    counts = POPCOUNT_NP[masks]
+    picks = (rng.random(len(masks)) * counts).astype(np.int64)
+    return NTH_BIT_NP[masks, np.minimum(picks, 9)]
+
+
+def random_step(steps, rng):
+    """
+    a uniformly random (src, dst) pair from the masks of the destinations of
+    every source vertex, an array of shape (n, 10)
+    """
+    counts = POPCOUNT_NP[steps]
+    cum = np.cumsum(counts, axis=1)
+    picks = (rng.random(len(steps)) * cum[:, -1]).astype(np.int64)
+    src = np.minimum(np.argmax(cum > picks[:, None], axis=1), 9)
+    every = np.arange(len(steps))
+    picks -= cum[every, src] - counts[every, src]
+    dst = NTH_BIT_NP[steps[every, src], np.clip(picks, 0, 9)]
+    return src, dst
+
+
+class BatchGames:
+    """
+    A batch of games advancing together, one ply per step.
+
+    The results & plies are kept for every game, while the other arrays
+    only hold the games still in the batch: once most of them are over,
+    the finished ones are dropped, so the long games don't keep paying for
+    the short ones. ids maps the games in the batch to the original games.
+    """
+    # the arrays dropping the finished games
+    PER_GAME = ('ids', 'crows', 'vloc', 'hand', 'captured', 'vturn', 'active',
+                'empty', 'jump_targets', 'vulture_steps', 'placed', 'vulture_targets',
+                'crow_steps', 'placing')
+
+    def __init__(self, positions, forced_jump=True, seed=None):
+        positions = np.asarray(positions, dtype=np.int64)
+        self.forced_jump = forced_jump
+        # a seed, or a Generator that is used as it is
+        self.rng = np.random.default_rng(seed)
+        self.ids = np.arange(len(positions))
+        self.crows = positions & ALL_VERTICES
+        self.vloc = positions >> VULTURE_SHIFT & 15
+        self.hand = positions >> HAND_SHIFT & 7
+        self.captured = positions >> CAPTURED_SHIFT & 7
+        self.vturn = (positions & VTURN) != 0
+        self.results = np.zeros(len(positions), dtype=np.int64)
+        self.active = np.ones(len(positions), dtype=bool)
+        self.plies = np.zeros(len(positions), dtype=np.int64)
+        self._find_moves()
+
+    @classmethod
+    def new_games(cls, n, forced_jump=True, seed=None):
+        """
+        a batch of n games from the initial position
+        """
+        return cls(np.full(n, INITIAL_POSITION), forced_jump, seed)
+
+    def __len__(self):
+        return len(self.crows)
+
+    def positions(self):
+        """
+        the packed positions of the games in the batch (see ids)
+        """
+        return (self.crows | self.vloc << VULTURE_SHIFT | self.hand << HAND_SHIFT |
+                self.captured << CAPTURED_SHIFT | np.where(self.vturn, VTURN, 0))
+
+    def _find_moves(self):
+        """
+        find the legal moves of all the games & finish the games that are over
+        """
+        self.empty = ALL_VERTICES & ~(self.crows | VULTURE_BIT_NP[self.vloc])
+        self.jump_targets = np.zeros(len(self), dtype=np.int64)
+        for k in range(2):
+            middle = JUMP_MIDDLE_NP[self.vloc, k]
+            target = JUMP_TARGET_NP[self.vloc, k]
+            can_jump = ((self.crows & middle) != 0) & ((self.empty & target) != 0)
+            self.jump_targets |= np.where(can_jump, target, 0)
+        self.vulture_steps = NEIGHBORS_NP[self.vloc] & self.empty
+        self.placed = self.vloc != NO_VULTURE
+        # the destinations of the vulture (a mask per game)
+        if self.forced_jump:
+            targets = np.where(self.jump_targets != 0, self.jump_targets, self.vulture_steps)
+        else:
+            targets = self.jump_targets | self.vulture_steps
+        self.vulture_targets = np.where(self.placed, targets, self.empty)
+        # the destinations of every crow on the board (a mask per game & vertex)
+        self.crow_steps = np.where((self.crows[:, None] >> VERTICES_NP & 1) != 0,
+                                   NEIGHBORS_NP[None, :10] & self.empty[:, None], 0)
+        crow_moves = np.bitwise_or.reduce(self.crow_steps, axis=1)
+        self.placing = self.hand > 0
+
+        # all the finished games are lost by the side to play
+        vulture_won = (self.captured >= CAPTURES_TO_WIN) | \
+            (~self.vturn & ~self.placing & (crow_moves == 0))
+        crows_won = self.vturn & self.placed & (self.vulture_targets == 0)
+        self.results[self.ids[self.active & vulture_won]] = VULTURE_WON
+        self.results[self.ids[self.active & crows_won & ~vulture_won]] = CROWS_WON
+        self.active &= ~(vulture_won | crows_won)
+
+    def _drop_finished(self):
+        """
+        drop the finished games from the batch
+        """
+        keep = self.active
+        for name in self.PER_GAME:
+            setattr(self, name, getattr(self, name)[keep])
+
+    def step(self, crows_policy, vulture_policy):
+        """
+        play one ply in all the games still going on
+
+        The policies get the batch & its rng; the vulture's returns the
+        destination of every game and the crows' the (src, dst) of every game
+        (src is ignored when a crow is placed from the hand).
+
+        Returns: True if any game is still going on
+        """
+        if not self.active.any():
+            return False
+
+        # the vulture places itself, jumps or steps
+        moving = self.active & self.vturn
+        if moving.any():
+            dst = vulture_policy(self, self.rng)
+            jumped = moving & self.placed & ((self.jump_targets >> dst & 1) != 0)
+            self.crows = np.where(jumped, self.crows & ~(1 << JUMP_OVER_NP[self.vloc, dst]),
+                                  self.crows)
+            self.captured = self.captured + jumped
+            self.vloc = np.where(moving, dst, self.vloc)
+
+        # the crows place one from the hand or step to a nearby vertex
+        moving = self.active & ~self.vturn
+        if moving.any():
+            src, dst = crows_policy(self, self.rng)
+            placing = moving & self.placing
+            stepping = moving & ~self.placing
+            self.crows = np.where(placing, self.crows | (1 << dst), self.crows)
+            self.crows = np.where(stepping, self.crows ^ (1 << src) ^ (1 << dst), self.crows)
+            self.hand = self.hand - placing
+
+        self.plies[self.ids[self.active]] += 1
+        self.vturn = np.where(self.active, ~self.vturn, self.vturn)
+        self._find_moves()
+        live = np.count_nonzero(self.active)
+        if live < len(self) // 2:
+            self._drop_finished()
+        return live > 0
+
+    def run(self, crows_policy, vulture_policy, max_plies=MAX_PLIES, deadline=None):
+        """
+        play all the games until they are over, max_plies more are played
+        or the time.perf_counter() deadline (if any) has passed
+
+        Returns: the results of the games (NO_RESULT for those still going on)
+        """
+        for _ in range(max_plies):
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if not self.step(crows_policy, vulture_policy):
+                break
+        return self.results
+
+
+def random_vulture(games, rng):
+    """
+    the vulture plays a random legal move
+    """
+    return random_bit(games.vulture_targets, rng)
+
+
+def greedy_vulture(games, rng):
+    """
+    the vulture captures whenever it can (even if the jumps are optional), else moves randomly
+    """
+    targets = np.where(games.placed & (games.jump_targets != 0),
+                       games.jump_targets, games.vulture_targets)
+    return random_bit(targets, rng)
+
+
+def random_crows(games, rng):
+    """
+    the crows play a random legal move
+    """
+    src, dst = random_step(games.crow_steps, rng)
+    return src, np.where(games.placing, random_bit(games.empty, rng), dst)
+
+
+def blocking_crows(games, rng):
+    """
+    the crows place & move next to the vulture when they can, else randomly
+    """
+    near = NEIGHBORS_NP[games.vloc]
+    empty = np.where((games.empty & near) != 0, games.empty & near, games.empty)
+    steps = games.crow_steps & near[:, None]
+    has_blocking = np.bitwise_or.reduce(steps, axis=1) != 0
+    steps = np.where(has_blocking[:, None], steps, games.crow_steps)
+    src, dst = random_step(steps, rng)
+    return src, np.where(games.placing, random_bit(empty, rng), dst)
+
+
+CROWS_POLICIES = {'random': random_crows, 'blocking': blocking_crows}
+VULTURE_POLICIES = {'random': random_vulture, 'greedy': greedy_vulture}
+
+
+def batched_rollouts(positions, rng, forced_jump=True, max_plies=MAX_PLIES, deadline=None):
+    """
+    play random games from an array of packed positions, all at once
+
+    Returns: an array of results, +1 if the crows won, -1 if the vulture won
+    and 0 if the game was still going on after max_plies (or at the deadline)
+    """
+    games = BatchGames(positions, forced_jump, rng)
+    return games.run(random_crows, random_vulture, max_plies, deadline)
+
+
+def main():
+    """
+    play a batch of games between two policies & report the win rates
+    """
+    parser = argparse.ArgumentParser(description="Simulate a batch of Kaooa games with NumPy.")
+    parser.add_argument('--games', type=int, default=100000, help="the number of games")
+    parser.add_argument('--crows', choices=CROWS_POLICIES, default='random')
+    parser.add_argument('--vulture', choices=VULTURE_POLICIES, default='random')
+    parser.add_argument('--optional-jump', action='store_true',
+                        help="the vulture may decline a jump (the rules of turt.py)")
+    parser.add_argument('--max-plies', type=int, default=MAX_PLIES,
+                        help="a game still going on after so many plies is a draw")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    begin = time.perf_counter()
+    games = BatchGames.new_games(args.games, not args.optional_jump, args.seed)
+    results = games.run(CROWS_POLICIES[args.crows], VULTURE_POLICIES[args.vulture],
+                        args.max_plies)
+    elapsed = time.perf_counter() - begin
+
+    print(f"{args.crows} crows vs {args.vulture} vulture: {args.games} games "
+          f"in {elapsed:.2f}s ({args.games / elapsed:.0f} games/sec), "
+          f"{games.plies.mean():.1f} plies on average")
+    for name, result in (('crows', CROWS_WON), ('vulture', VULTURE_WON), ('draws', NO_RESULT)):
+        count = int((results == result).sum())
+        print(f"  {name}: {count} ({100 * count / args.games:.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
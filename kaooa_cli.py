@@ -0,0 +1,88 @@
+"""
+Play the Kaooa game in a terminal, without any graphics.
+
+This is the headless entry point: it only imports the rules engine (never
+turtle or tkinter), so it starts in milliseconds and runs where there is
+no display, e.g. over ssh. The vertices are numbered as in kaooa.py:
+the corners of the star are 0-4 and the inner vertices 5-9.
+"""
+
+import argparse
+
+from kaooa_engine import CROW, VULTURE, MOVES, KaooaEngine
+
+SYMBOLS = {CROW: 'C', VULTURE: 'V', '': '.'}
+
+
+def format_board(engine):
+    """
+    the vertices & the counters of a game as a line of text
+    """
+    vertices = ' '.join(f"{vertex}{SYMBOLS[piece]}" for vertex, piece in enumerate(engine.state))
+    turn = "vulture" if engine.vturn else "crows"
+    return (f"{vertices} | in hand: {engine.crows_in_hand()} "
+            f"captured: {engine.captured} | turn: {turn}")
+
+
+def parse_move(engine, text):
+    """
+    find the legal move typed as "dst" (a placement) or "src dst"
+
+    Returns: the move or None if the text isn't a legal move
+    """
+    try:
+        vertices = [int(word) for word in text.split()]
+    except ValueError:
+        return None
+    if len(vertices) == 1:
+        vertices.insert(0, -1)
+    if len(vertices) != 2:
+        return None
+    return engine.find_move(*vertices)
+
+
+def main():
+    """
+    play a game in the terminal, the user typing the moves
+    """
+    parser = argparse.ArgumentParser(description="Play Kaooa in the terminal.")
+    parser.add_argument('--vulture-ai', action='store_true',
+                        help="the computer plays the vulture")
+    parser.add_argument('--think-time', type=int, default=50,
+                        help="milliseconds the computer thinks about a move (default: 50)")
+    parser.add_argument('--optional-jump', action='store_true',
+                        help="the vulture may decline a jump (the rules of turt.py)")
+    args = parser.parse_args()
+
+    forced_jump = not args.optional_jump
+    engine = KaooaEngine(forced_jump)
+    vulture_player = None
+    if args.vulture_ai:
+        # imported here so a game between two users only loads the rules engine
+        from kaooa_search import make_vulture_ai
+        vulture_player = make_vulture_ai(forced_jump, args.think_time / 1000)
+
+    print("Type a vertex to place a piece or two vertices to move one, e.g. '5 9'.")
+    while engine.winner() is None:
+        print(format_board(engine))
+        if engine.vturn and vulture_player is not None:
+            move = vulture_player.choose_move(engine.position)
+            src, dst, _ = MOVES[move]
+            print(f"vulture: {dst}" if src < 0 else f"vulture: {src} {dst}")
+        else:
+            try:
+                text = input("move> ")
+            except EOFError:
+                return
+            move = parse_move(engine, text)
+            if move is None:
+                print("not a legal move")
+                continue
+        engine.apply(move)
+
+    print(format_board(engine))
+    print("Vulture Won the Game!" if engine.winner() == 'vulture' else "Crows Won the Game!")
+
+
+if __name__ == '__main__':
+    main()
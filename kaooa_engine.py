@@ -0,0 +1,403 @@
+"""
+A headless rules engine for the Kaooa game (a.k.a Vulture vs Crows game).
+
+Nothing in here touches the turtle graphics library, so positions can be
+played, searched & simulated without a display.
+
+A position is packed into a single int:
+    bits 0-9    a mask of the vertices holding a crow
+    bits 10-13  the vertex of the vulture (NO_VULTURE before it is placed)
+    bits 14-16  the number of crows yet to be placed (in hand)
+    bits 17-19  the number of captured crows
+    bit  20     set when it is the vulture's turn
+
+A move is an int indexing the MOVES table of (src, dst, over) vertices:
+src is -1 when a piece is placed from the hand and
+over is -1 unless the vulture jumps over (captures) a crow there.
+MOVE_PIECE tells which piece makes the move and every move just adds
+MOVE_DELTA[move] to the packed position.
+"""
+
+from kaooa_tables import NEIGHBORS, NEIGHBOR_MASK, JUMP, JUMP_MASKS
+
+# contents of a vertex
+EMPTY = ''
+CROW = 'crow'
+VULTURE = 'vulture'
+
+# the crows have 7 pieces; the vulture wins after capturing 4 of them
+NCROWS = 7
+CAPTURES_TO_WIN = 4
+# a game still going on after so many plies is a draw when playing out games
+MAX_PLIES = 200
+
+# layout of the packed position
+ALL_VERTICES = (1 << 10) - 1
+VULTURE_SHIFT = 10
+HAND_SHIFT = 14
+CAPTURED_SHIFT = 17
+VTURN = 1 << 20
+NO_VULTURE = 10
+
+# the bit of the vulture's vertex; nothing when it is not placed yet
+VULTURE_BIT = [1 << v for v in range(10)] + [0] * 6
+
+
+def pack_position(crows, vulture, in_hand, captured, vturn):
+    """
+    pack the fields of a position into an int
+    """
+    return (crows | vulture << VULTURE_SHIFT | in_hand << HAND_SHIFT |
+            captured << CAPTURED_SHIFT | (VTURN if vturn else 0))
+
+
+def crows_of(position):
+    """the mask of the vertices holding a crow"""
+    return position & ALL_VERTICES
+
+
+def vulture_of(position):
+    """the vertex of the vulture or NO_VULTURE"""
+    return position >> VULTURE_SHIFT & 15
+
+
+def in_hand_of(position):
+    """the number of crows yet to be placed"""
+    return position >> HAND_SHIFT & 7
+
+
+def captured_of(position):
+    """the number of captured crows"""
+    return position >> CAPTURED_SHIFT & 7
+
+
+def vturn_of(position):
+    """True if it is the vulture's turn"""
+    return bool(position & VTURN)
+
+
+INITIAL_POSITION = pack_position(0, NO_VULTURE, NCROWS, 0, False)
+
+
+def _build_moves():
+    """
+    enumerate every possible move once, along with the tables used to generate them
+    """
+    moves = []
+    deltas = []
+    pieces = []
+
+    def add(src, dst, over, delta, piece):
+        moves.append((src, dst, over))
+        deltas.append(delta)
+        pieces.append(piece)
+        return len(moves) - 1
+
+    # crows: place from the hand or step to a nearby vertex
+    crow_place = [add(-1, d, -1, (1 << d) - (1 << HAND_SHIFT) + VTURN, CROW)
+                  for d in range(10)]
+    crow_steps = [tuple((1 << d, add(s, d, -1, (1 << d) - (1 << s) + VTURN, CROW))
+                        for d in NEIGHBORS[s]) for s in range(10)]
+    # vulture: place, step to a nearby vertex or jump over a crow
+    vulture_place = [add(-1, d, -1, ((d - NO_VULTURE) << VULTURE_SHIFT) - VTURN, VULTURE)
+                     for d in range(10)]
+    vulture_steps = [tuple((1 << d, add(s, d, -1, ((d - s) << VULTURE_SHIFT) - VTURN, VULTURE))
+                           for d in NEIGHBORS[s]) for s in range(10)]
+    vulture_jumps = [tuple((middle_bit, target_bit,
+                            add(s, d, o, ((d - s) << VULTURE_SHIFT) - middle_bit +
+                                (1 << CAPTURED_SHIFT) - VTURN, VULTURE))
+                           for (o, d), (middle_bit, target_bit) in zip(JUMP[s], JUMP_MASKS[s]))
+                     for s in range(10)]
+
+    # the placements on every possible mask of empty vertices, each mask
+    # extending the one without its highest vertex
+    def placements(table):
+        result = [()]
+        for empty in range(1, ALL_VERTICES + 1):
+            highest = empty.bit_length() - 1
+            result.append(result[empty ^ (1 << highest)] + (table[highest],))
+        return result
+
+    return (moves, deltas, pieces, placements(crow_place), crow_steps,
+            placements(vulture_place), vulture_steps, vulture_jumps)
+
+
+(MOVES, MOVE_DELTA, MOVE_PIECE, CROW_PLACEMENTS, CROW_STEPS,
+ VULTURE_PLACEMENTS, VULTURE_STEPS, VULTURE_JUMPS) = _build_moves()
+
+
+def check_jump_possible(position, vloc):
+    """
+    check if a jump is possible from the vertex vloc of the vulture
+    """
+    crows = position & ALL_VERTICES
+    for middle_bit, target_bit, _ in VULTURE_JUMPS[vloc]:
+        if crows & middle_bit and not crows & target_bit:
+            return True
+    return False
+
+
+def check_any_vmove_possible(position, vloc):
+    """
+    check if any move possible for the vulture at location vloc
+    """
+    # check if any nearby move possible
+    if NEIGHBOR_MASK[vloc] & ~position & ALL_VERTICES:
+        return True
+
+    # check for any jump-over locations possible
+    return check_jump_possible(position, vloc)
+
+
+def crows_can_move(position):
+    """
+    check if the crows have any move (a placement or a step to a nearby empty vertex)
+    """
+    if position >> HAND_SHIFT & 7:
+        return True
+    crows = position & ALL_VERTICES
+    empty = ALL_VERTICES & ~(crows | VULTURE_BIT[position >> VULTURE_SHIFT & 15])
+    loc = 0
+    while crows:
+        if crows & 1 and NEIGHBOR_MASK[loc] & empty:
+            return True
+        crows >>= 1
+        loc += 1
+    return False
+
+
+def legal_moves(position, forced_jump=True):
+    """
+    all the legal moves of the side to play (the game over is not checked here)
+
+    Args: the packed position, and whether the vulture is forced to jump when it can
+    Returns: a list (or a tuple) of moves
+    """
+    crows = position & ALL_VERTICES
+    vloc = position >> VULTURE_SHIFT & 15
+    empty = ALL_VERTICES & ~(crows | VULTURE_BIT[vloc])
+
+    if position & VTURN:
+        # the first move of the vulture places it on any empty vertex
+        if vloc == NO_VULTURE:
+            return VULTURE_PLACEMENTS[empty]
+        moves = [move for middle_bit, target_bit, move in VULTURE_JUMPS[vloc]
+                 if crows & middle_bit and empty & target_bit]
+        # make sure no compulsory jumping
+        if moves and forced_jump:
+            return moves
+        moves += [move for bit, move in VULTURE_STEPS[vloc] if empty & bit]
+        return moves
+
+    if position >> HAND_SHIFT & 7:
+        return CROW_PLACEMENTS[empty]
+    moves = []
+    loc = 0
+    while crows:
+        if crows & 1:
+            moves += [move for bit, move in CROW_STEPS[loc] if empty & bit]
+        crows >>= 1
+        loc += 1
+    return moves
+
+
+def winner(position):
+    """
+    Returns: 'vulture' or 'crows' if the game is over, otherwise None
+    """
+    if position >> CAPTURED_SHIFT & 7 >= CAPTURES_TO_WIN:
+        return 'vulture'
+
+    if position & VTURN:
+        vloc = position >> VULTURE_SHIFT & 15
+        # initial state; no trapping obviously!
+        # if all adjacent vertices are occupied by crows & no jumpover as well
+        if vloc != NO_VULTURE and not check_any_vmove_possible(position, vloc):
+            return 'crows'
+    elif not crows_can_move(position):
+        # the crows can't move any further
+        return 'vulture'
+
+    return None
+
+
+def position_state(position):
+    """
+    the contents of the 10 vertices as a list of strings ('', 'crow' or 'vulture')
+    """
+    state = [CROW if position >> v & 1 else EMPTY for v in range(10)]
+    vloc = vulture_of(position)
+    if vloc != NO_VULTURE:
+        state[vloc] = VULTURE
+    return state
+
+
+def state_position(state, captured, vturn):
+    """
+    pack a list of the 10 vertex contents (as in Kaooa.state) into a position
+    """
+    crows = sum(1 << v for v in range(10) if state[v] == CROW)
+    vloc = state.index(VULTURE) if VULTURE in state else NO_VULTURE
+    in_hand = NCROWS - state.count(CROW) - captured
+    return pack_position(crows, vloc, in_hand, captured, vturn)
+
+
+class RandomPlayer:
+    """
+    Plays a random legal move, as the computer of turt.py once did
+    """
+    def __init__(self, forced_jump=True, rng=None):
+        self.forced_jump = forced_jump
+        if rng is None:
+            # imported here so importing the rules stays cheap
+            import random
+            rng = random.Random()
+        self.rng = rng
+
+    def choose_move(self, position):
+        """
+        Returns: a random legal move or None if the game is over
+        """
+        if winner(position) is not None:
+            return None
+        return self.rng.choice(legal_moves(position, self.forced_jump))
+
+
+def play_game(crows_player, vulture_player, max_plies=MAX_PLIES, position=INITIAL_POSITION):
+    """
+    play a game between two players with a choose_move(position) method
+
+    Returns: the (winner, moves) of the game; the winner is 'crows', 'vulture'
+    or None if the game is still going on after max_plies
+    """
+    moves = []
+    while len(moves) < max_plies:
+        result = winner(position)
+        if result is not None:
+            return result, moves
+        player = vulture_player if position & VTURN else crows_player
+        move = player.choose_move(position)
+        moves.append(move)
+        position += MOVE_DELTA[move]
+    return winner(position), moves
+
+
+class KaooaEngine:
+    """
+    The rules of the game without any graphics, holding the packed position
+    of a single game along with the moves applied & the moves taken back.
+
+    A move is its own undo record: unmaking it subtracts MOVE_DELTA[move]
+    from the position, so undo & redo are O(1) & store one int per move.
+    """
+    def __init__(self, forced_jump=True):
+        # kaooa.py forces the vulture to jump whenever it can; turt.py doesn't
+        self.forced_jump = forced_jump
+        # initial positions are all empty & crows start the game
+        self.position = INITIAL_POSITION
+        # the moves applied & the moves undone (the last one first to redo)
+        self.history = []
+        self.undone = []
+        # the legal moves of the last position asked for
+        self._moves_position = None
+        self._moves = ()
+
+    @property
+    def state(self):
+        """the contents of the 10 vertices"""
+        return position_state(self.position)
+
+    @property
+    def captured(self):
+        """the number of captured crows"""
+        return captured_of(self.position)
+
+    @property
+    def vturn(self):
+        """True if it is the vulture's turn"""
+        return vturn_of(self.position)
+
+    def crows_in_hand(self):
+        """
+        the number of crows yet to be placed on the board
+        """
+        return in_hand_of(self.position)
+
+    def vulture_vertex(self):
+        """
+        the vertex of the vulture or -1 if it is not placed yet
+        """
+        vloc = vulture_of(self.position)
+        return -1 if vloc == NO_VULTURE else vloc
+
+    def check_jump_possible(self, vloc):
+        """
+        check if a jump is possible from the vertex vloc of the vulture
+        """
+        return check_jump_possible(self.position, vloc)
+
+    def check_any_vmove_possible(self, vloc):
+        """
+        check if any move possible for the vulture at location vloc
+        """
+        return check_any_vmove_possible(self.position, vloc)
+
+    def legal_moves(self):
+        """
+        all the legal moves of the side to play, generated once per position
+        """
+        if self._moves_position != self.position:
+            self._moves_position = self.position
+            if winner(self.position) is not None:
+                self._moves = ()
+            else:
+                self._moves = tuple(legal_moves(self.position, self.forced_jump))
+        return self._moves
+
+    def find_move(self, src, dst):
+        """
+        find the legal move from src to dst (src is -1 for a placement)
+
+        Returns: the move or None if there is no such legal move
+        """
+        for move in self.legal_moves():
+            if MOVES[move][0] == src and MOVES[move][1] == dst:
+                return move
+        return None
+
+    def apply(self, move):
+        """
+        change the position by playing a (legal) move of the side to play
+        (a new move can't be redone after the moves undone before it)
+        """
+        self.history.append(move)
+        self.position += MOVE_DELTA[move]
+        self.undone.clear()
+
+    def undo(self):
+        """
+        take back the last move applied
+
+        Returns: the move taken back
+        """
+        move = self.history.pop()
+        self.position -= MOVE_DELTA[move]
+        self.undone.append(move)
+        return move
+
+    def redo(self):
+        """
+        play again the last move taken back
+
+        Returns: the move played
+        """
+        move = self.undone.pop()
+        self.position += MOVE_DELTA[move]
+        self.history.append(move)
+        return move
+
+    def winner(self):
+        """
+        Returns: 'vulture' or 'crows' if the game is over, otherwise None
+        """
+        return winner(self.position)
@@ -0,0 +1,108 @@
+"""
+The geometry of the Kaooa star, for a board of any size.
+
+The star is symmetric about the y axis: its top line joins the corners 0 & 1
+(side units apart) & the corner 3 is on the axis. The inner vertices 5-9 are
+where its lines cross; they are computed once for the star of side 1 with
+closed forms of its corners (no general intersection of lines, so no slopes
+& no special case for vertical lines) & the mirror symmetry. Every size is
+then only a scaling of that star, done once per size.
+
+The hit test of the clicks (VertexGrid) is pure geometry too, so whatever
+finds the vertex under a point doesn't need turtle or tkinter.
+"""
+
+import math
+from functools import lru_cache
+
+
+def _unit_star():
+    """
+    the 10 vertices of the star of side 1, numbered as in kaooa_tables
+    """
+    half_side = 0.5
+    h = half_side / math.cos(math.radians(18))
+    r = half_side * math.tan(math.radians(18))
+    a = h * math.cos(math.radians(36))
+    b = h * math.sin(math.radians(36))
+    corners = [(-half_side, r), (half_side, r), (-a, -b), (0.0, h), (a, -b)]
+
+    # the lines 1-2 & 4-0 cross on the axis, the lines 2-3 & 3-4 cross the
+    # top line 0-1; the vertices 8 & 9 mirror 7 & 6
+    v5 = (0.0, r - (r + b) * half_side / (half_side + a))
+    # the line 2-3 is x = p (y - h) & the line 0-4 is x = q (r - y) - half_side
+    p = a / (h + b)
+    q = (half_side + a) / (r + b)
+    y6 = (p * h + q * r - half_side) / (p + q)
+    v6 = (p * (y6 - h), y6)
+    v7 = (-a * (h - r) / (h + b), r)
+    v8 = (-v7[0], r)
+    v9 = (-v6[0], v6[1])
+    return tuple(corners + [v5, v6, v7, v8, v9])
+
+
+UNIT_STAR = _unit_star()
+
+
+@lru_cache(maxsize=64)
+def star_coordinates(side):
+    """
+    the coordinates of all the 10 vertices of a star with center at (0,0)
+
+    Returns: a tuple of (x, y) points, computed once per side
+    """
+    return tuple((x * side, y * side) for x, y in UNIT_STAR)
+
+
+class VertexGrid:
+    """
+    Finds the vertex under a point of the screen in O(1).
+
+    The window is cut into square cells & every cell keeps the vertices
+    within reach of it (rarely more than one, where two vertices are close),
+    so a click or a mouse motion is resolved by one lookup in the grid & a
+    squared-distance check per vertex kept: the nearest one within the
+    radius is under the point.
+    """
+    def __init__(self, coords, radius=20, size=600, cell=8):
+        self.coords = coords
+        self.radius2 = radius * radius
+        self.half = size // 2
+        self.cell = cell
+        self.ncells = -(-size // cell)
+        self.cells = [()] * (self.ncells * self.ncells)
+        # the cells within reach of a vertex (a whole cell may be closer
+        # than its center by up to half its diagonal)
+        reach = radius + cell * 0.71
+        for vertex, (vx, vy) in enumerate(coords):
+            for row in self._cell_range(vy, reach):
+                cy = (row + 0.5) * cell - self.half
+                for col in self._cell_range(vx, reach):
+                    cx = (col + 0.5) * cell - self.half
+                    if (cx - vx) ** 2 + (cy - vy) ** 2 <= reach * reach:
+                        self.cells[row * self.ncells + col] += (vertex,)
+
+    def _cell_range(self, center, reach):
+        """
+        the rows (or columns) of the cells within reach of a coordinate
+        """
+        first = max(0, int((center - reach + self.half) // self.cell))
+        last = min(self.ncells - 1, int((center + reach + self.half) // self.cell))
+        return range(first, last + 1)
+
+    def vertex_at(self, x, y):
+        """
+        Returns: the nearest vertex within the radius of the point (x, y) or None
+        """
+        col = int((x + self.half) // self.cell)
+        row = int((y + self.half) // self.cell)
+        if not (0 <= col < self.ncells and 0 <= row < self.ncells):
+            return None
+        nearest = None
+        nearest2 = self.radius2
+        for vertex in self.cells[row * self.ncells + col]:
+            vx, vy = self.coords[vertex]
+            distance2 = (x - vx) ** 2 + (y - vy) ** 2
+            if distance2 <= nearest2:
+                nearest, nearest2 = vertex, distance2
+        return nearest
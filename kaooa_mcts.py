@@ -0,0 +1,172 @@
+"""
+A Monte Carlo Tree Search player for the Kaooa game (requires NumPy).
+
+The tree is grown by UCT over the packed positions of kaooa_engine. The new
+leaves are scored in batches of random playouts that advance together as
+NumPy arrays of bitmasks (see kaooa_batch), one array operation per ply for
+the whole batch, instead of one Python loop per game.
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from kaooa_engine import (VTURN, MAX_PLIES, MOVE_DELTA, RandomPlayer, legal_moves,
+                          winner, play_game)
+from kaooa_batch import batched_rollouts
+from kaooa_search import AlphaBetaPlayer
+
+
+class Node:
+    """
+    A node of the search tree: the position after a move, with the
+    playout results counted for the side that made the move
+    """
+    __slots__ = ('position', 'move', 'parent', 'children', 'untried', 'visits', 'value')
+
+    def __init__(self, position, forced_jump, move=None, parent=None):
+        self.position = position
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = [] if winner(position) is not None else \
+            list(legal_moves(position, forced_jump))
+        self.visits = 0
+        self.value = 0.0
+
+    def select_child(self, exploration):
+        """
+        the child with the highest upper confidence bound (UCT)
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.value / child.visits +
+                   exploration * math.sqrt(log_visits / child.visits))
+
+
+class MCTSPlayer:
+    """
+    Chooses a move by Monte Carlo Tree Search within a time budget.
+
+    Every iteration selects a batch of leaves by UCT (a virtual loss keeps the
+    selections of one batch apart) and plays them all out in one batch.
+    """
+    def __init__(self, forced_jump=True, time_budget=0.05, exploration=1.4,
+                 leaves_per_batch=32, playouts_per_leaf=4, max_plies=MAX_PLIES, seed=None):
+        self.forced_jump = forced_jump
+        # seconds to think about a move
+        self.time_budget = time_budget
+        # the exploration constant of UCT
+        self.exploration = exploration
+        self.leaves_per_batch = leaves_per_batch
+        self.playouts_per_leaf = playouts_per_leaf
+        self.max_plies = max_plies
+        self.rng = np.random.default_rng(seed)
+        # statistics of the last search
+        self.playouts = 0
+        self.iterations = 0
+
+    def choose_move(self, position):
+        """
+        search a position for the best move of the side to play
+
+        Returns: the most visited move or None if the game is over
+        """
+        root = Node(position, self.forced_jump)
+        if not root.untried:
+            return None
+        if len(root.untried) == 1:
+            return root.untried[0]
+
+        # a batch stops its playouts at the deadline; a new batch only starts
+        # if about half of one (as long as the last) fits before it
+        deadline = time.perf_counter() + self.time_budget
+        self.playouts = 0
+        self.iterations = 0
+        batch_time = 0.0
+        while not self.iterations or time.perf_counter() + batch_time / 2 < deadline:
+            begin = time.perf_counter()
+            self._iterate(root, deadline)
+            batch_time = time.perf_counter() - begin
+            self.iterations += 1
+        return max(root.children, key=lambda child: child.visits).move
+
+    def _select_leaf(self, root):
+        """
+        walk down by UCT & expand one untried move, adding a virtual loss on the way
+        """
+        node = root
+        while not node.untried and node.children:
+            node = node.select_child(self.exploration)
+        if node.untried:
+            move = node.untried.pop()
+            child = Node(node.position + MOVE_DELTA[move], self.forced_jump, move, node)
+            node.children.append(child)
+            node = child
+        leaf = node
+        while node is not None:
+            node.visits += 1
+            node = node.parent
+        return leaf
+
+    def _iterate(self, root, deadline=None):
+        """
+        select a batch of leaves, play them out together & back up the results
+        (the playouts still going on at the deadline count as draws)
+        """
+        leaves = [self._select_leaf(root) for _ in range(self.leaves_per_batch)]
+        playouts = self.playouts_per_leaf
+        results = batched_rollouts(np.repeat([leaf.position for leaf in leaves], playouts),
+                                   self.rng, self.forced_jump, self.max_plies, deadline)
+        self.playouts += len(results)
+        scores = results.reshape(len(leaves), playouts).sum(axis=1)
+
+        for leaf, crows_score in zip(leaves, scores.tolist()):
+            # the virtual loss was one visit without any value
+            node = leaf
+            while node is not None:
+                node.visits += playouts - 1
+                if node.parent is not None:
+                    # a win scores 1, a draw 0.5 & a loss 0 for the side that moved
+                    mover_is_vulture = bool(node.parent.position & VTURN)
+                    score = -crows_score if mover_is_vulture else crows_score
+                    node.value += (playouts + score) / 2
+                node = node.parent
+
+
+def main():
+    """
+    compare the MCTS player against random play & alpha-beta at the same time budget
+    """
+    parser = argparse.ArgumentParser(description="Play the MCTS player against other players.")
+    parser.add_argument('--games', type=int, default=10, help="games per side of each match")
+    parser.add_argument('--think-time', type=int, default=50,
+                        help="milliseconds per move of every player (default: 50)")
+    parser.add_argument('--optional-jump', action='store_true',
+                        help="the vulture may decline a jump (the rules of turt.py)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    forced_jump = not args.optional_jump
+    budget = args.think_time / 1000
+    mcts = MCTSPlayer(forced_jump, time_budget=budget, seed=args.seed)
+    opponents = {
+        'random': RandomPlayer(forced_jump),
+        'alphabeta': AlphaBetaPlayer(forced_jump, time_budget=budget),
+    }
+    for name, opponent in opponents.items():
+        for mcts_side in ('crows', 'vulture'):
+            counts = {'crows': 0, 'vulture': 0, None: 0}
+            for _ in range(args.games):
+                if mcts_side == 'crows':
+                    result, _ = play_game(mcts, opponent)
+                else:
+                    result, _ = play_game(opponent, mcts)
+                counts[result] += 1
+            print(f"mcts as {mcts_side} vs {name}: mcts won {counts[mcts_side]}, "
+                  f"lost {args.games - counts[mcts_side] - counts[None]}, drew {counts[None]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Perft: count the leaf nodes of the game tree to a fixed depth.
+
+The counts of the move generator of kaooa_engine are checked against
+known-good values from the start & from a few curated positions, under
+both the forced jumps of kaooa.py & the optional jumps of turt.py. Any
+change to the move generation must keep them; the nodes/sec are the
+baseline of its speed.
+
+A finished game has no moves, so it has no leaves below it (it counts as
+a leaf only at depth 0). The leaves of depth 1 are counted without being
+played (bulk counting).
+"""
+
+import argparse
+import time
+
+from kaooa_engine import INITIAL_POSITION, MOVE_DELTA, legal_moves, winner
+from kaooa_record import parse_record
+
+# the curated positions as the moves from the start in the notation of kaooa_record
+PERFT_POSITIONS = {
+    'start': "",
+    # the vulture can jump 2x6>7 during the placements
+    'placement-jump': "P6 P2 P8",
+    # all the crows placed & none captured
+    'midgame': "P8 P2 P1 2-5 P3 5-2 P7 2-5 P9 5-2 P4 2-6 P5 6-2 7-0 2-6 8-7",
+    # two captured, the vulture to play with a jump it may decline
+    'jumps': "P8 P6 P0 6-7 P1 7-3 P9 3-7 P6 7x6>2 P3 2-5 P2 5-4 2-5 4x5>6 3-7",
+    # three captured, the crows to play
+    'endgame': "P8 P2 P1 2-5 P3 5-2 P7 2-5 P9 5-2 P4 2-6 P5 6-2 7-0 2-6 8-7 6-2 3-8 "
+               "2-6 5-2 6x7>3 0-6 3-7 8-3 7-8 4-5 8x9>4 3-7 4-9 1-8 9x8>3",
+}
+
+# the known-good counts of depth 1, 2, ... by (position, forced_jump)
+KNOWN_COUNTS = {
+    ('start', True): (10, 90, 720, 1500, 10780, 23460, 149360, 296900),
+    ('placement-jump', True): (1, 8, 11, 85, 147, 1020, 2467, 14630, 27007, 133795, 250768),
+    ('midgame', True): (1, 7, 6, 24, 30, 171, 205, 1095, 1553, 8974, 13117),
+    ('jumps', True): (1, 5, 5, 6, 11, 42, 66, 261, 555, 2815, 5301),
+    ('endgame', True): (5, 6, 21, 38, 134, 258, 1211, 2509, 12149, 23746, 112692),
+    ('start', False): (10, 90, 720, 1960, 14000, 38720, 244080, 598960),
+    ('placement-jump', False): (2, 15, 54, 368, 776, 4721, 12883, 69822, 143736, 670502),
+    ('midgame', False): (1, 7, 7, 29, 45, 250, 342, 1844, 3180, 18989, 33912),
+    ('jumps', False): (3, 16, 33, 177, 394, 2370, 5158, 30172, 68323, 402353),
+    ('endgame', False): (5, 8, 34, 114, 602, 1260, 6393, 18010, 96867, 223792),
+}
+
+
+def perft_position(name):
+    """
+    the packed position of a curated position
+    """
+    _, moves = parse_record("D " + PERFT_POSITIONS[name])
+    position = INITIAL_POSITION
+    for move in moves:
+        position += MOVE_DELTA[move]
+    return position
+
+
+def perft(position, depth, forced_jump=True):
+    """
+    Returns: the number of leaf nodes depth plies below a position
+    """
+    if depth == 0:
+        return 1
+    if winner(position) is not None:
+        return 0
+    moves = legal_moves(position, forced_jump)
+    if depth == 1:
+        return len(moves)
+    return sum(perft(position + MOVE_DELTA[move], depth - 1, forced_jump) for move in moves)
+
+
+def main():
+    """
+    check the known counts (or count one position) & report the nodes/sec
+    """
+    parser = argparse.ArgumentParser(description="Count the leaf nodes of the Kaooa game tree.")
+    parser.add_argument('--position', choices=PERFT_POSITIONS,
+                        help="count only this position (default: check all the known counts)")
+    parser.add_argument('--depth', type=int,
+                        help="the maximum depth (default: all the known depths)")
+    parser.add_argument('--optional-jump', action='store_true',
+                        help="only the rules of turt.py (the vulture may decline a jump)")
+    parser.add_argument('--forced-jump', action='store_true',
+                        help="only the rules of kaooa.py (the vulture has to jump)")
+    args = parser.parse_args()
+
+    rules = [True, False]
+    if args.optional_jump != args.forced_jump:
+        rules = [args.forced_jump]
+    names = [args.position] if args.position else list(PERFT_POSITIONS)
+
+    failures = 0
+    total_nodes = 0
+    total_time = 0.0
+    for forced_jump in rules:
+        for name in names:
+            known = KNOWN_COUNTS.get((name, forced_jump), ())
+            depth = args.depth or len(known)
+            position = perft_position(name)
+            for d in range(1, depth + 1):
+                begin = time.perf_counter()
+                count = perft(position, d, forced_jump)
+                elapsed = time.perf_counter() - begin
+                total_nodes += count
+                total_time += elapsed
+                status = ''
+                if d <= len(known):
+                    status = 'ok' if count == known[d - 1] else f'FAILED (expected {known[d - 1]})'
+                    failures += count != known[d - 1]
+                print(f"{name} {'forced' if forced_jump else 'optional'} depth {d}: "
+                      f"{count} {status} ({elapsed:.3f}s, {count / max(elapsed, 1e-9):.0f} nodes/sec)")
+
+    print(f"{total_nodes} nodes in {total_time:.2f}s ({total_nodes / max(total_time, 1e-9):.0f} nodes/sec)")
+    if failures:
+        parser.exit(1, f"{failures} count(s) differ from the known ones\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Records of Kaooa games in a compact move notation.
+
+Every move has a short name, looked up in a table built once at import:
+    P3      a piece placed on the vertex 3 (the side to play tells which)
+    5-9     a step from the vertex 5 to 9
+    0x7>8   a jump from 0 over the crow on 7 to 8
+A record is one line per game: the result (C for the crows, V for the
+vulture, D for a draw) then the moves, all separated by spaces, e.g.
+    V P6 P2 P8 2x6>7 P0 7x8>1 P6 1-8 ...
+The crows always move first & the sides alternate, so the side of every
+move is known from its ply. Records are appended & read back one line at a
+time, so a file of millions of games is streamed without loading it.
+"""
+
+import argparse
+import time
+
+from kaooa_engine import INITIAL_POSITION, MOVES, MOVE_DELTA, MOVE_PIECE, VULTURE, legal_moves
+
+RESULT_CODES = {'crows': 'C', 'vulture': 'V', None: 'D'}
+CODE_RESULTS = {code: winner for winner, code in RESULT_CODES.items()}
+
+
+def _notation(move):
+    """
+    the name of a move in the notation
+    """
+    src, dst, over = MOVES[move]
+    if src < 0:
+        return f"P{dst}"
+    if over < 0:
+        return f"{src}-{dst}"
+    return f"{src}x{over}>{dst}"
+
+
+MOVE_NOTATION = tuple(_notation(move) for move in range(len(MOVES)))
+
+# the moves by their name for each side to play: (crows, vulture)
+NOTATION_MOVES = ({}, {})
+for _move, _name in enumerate(MOVE_NOTATION):
+    NOTATION_MOVES[MOVE_PIECE[_move] == VULTURE][_name] = _move
+
+
+def format_record(winner, moves):
+    """
+    the line of text of a game (without the newline)
+    """
+    return ' '.join([RESULT_CODES[winner]] + [MOVE_NOTATION[move] for move in moves])
+
+
+def parse_record(line):
+    """
+    read a game from its line of text
+
+    Returns: the (winner, moves) of the game
+    Raises: ValueError if the line is not a record
+    """
+    code, *names = line.split()
+    try:
+        return CODE_RESULTS[code], [NOTATION_MOVES[ply & 1][name]
+                                    for ply, name in enumerate(names)]
+    except KeyError as error:
+        raise ValueError(f"not a game record: {error}") from None
+
+
+def write_records(file, games):
+    """
+    append games to an open text file, one line each
+
+    Args: an iterable of (winner, moves)
+    """
+    file.writelines(format_record(winner, moves) + '\n' for winner, moves in games)
+
+
+def read_records(file):
+    """
+    stream the games of an open text file, one line at a time
+
+    Yields: the (winner, moves) of every game
+    Raises: ValueError (with the line number) at a line that is not a record
+    """
+    for number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            yield parse_record(line)
+        except ValueError as error:
+            raise ValueError(f"line {number}: {error}") from None
+
+
+def check_game(moves, forced_jump=True):
+    """
+    replay a game to check that all its moves are legal
+
+    Returns: the final position
+    Raises: ValueError at the first illegal move
+    """
+    position = INITIAL_POSITION
+    for ply, move in enumerate(moves):
+        if move not in legal_moves(position, forced_jump):
+            raise ValueError(f"illegal move {MOVE_NOTATION[move]} at ply {ply}")
+        position += MOVE_DELTA[move]
+    return position
+
+
+def main():
+    """
+    read record files & report the results of their games
+    """
+    parser = argparse.ArgumentParser(description="Summarize Kaooa game records.")
+    parser.add_argument('files', nargs='+', help="the record files, e.g. selfplay.txt")
+    parser.add_argument('--check', action='store_true',
+                        help="replay every game to check that its moves are legal")
+    parser.add_argument('--optional-jump', action='store_true',
+                        help="check with the rules of turt.py (the vulture may decline a jump)")
+    args = parser.parse_args()
+
+    counts = dict.fromkeys(RESULT_CODES, 0)
+    plies = 0
+    begin = time.perf_counter()
+    for path in args.files:
+        with open(path, encoding='utf-8') as file:
+            for number, (winner, moves) in enumerate(read_records(file), 1):
+                if args.check:
+                    try:
+                        check_game(moves, not args.optional_jump)
+                    except ValueError as error:
+                        parser.error(f"{path}: game {number}: {error}")
+                counts[winner] += 1
+                plies += len(moves)
+    elapsed = time.perf_counter() - begin
+
+    games = sum(counts.values())
+    print(f"{games} games read in {elapsed:.2f}s ({games / max(elapsed, 1e-9):.0f} games/sec), "
+          f"{plies / max(games, 1):.1f} plies per game")
+    for winner, count in counts.items():
+        name = winner or 'draws'
+        print(f"  {name}: {count} ({100 * count / max(games, 1):.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
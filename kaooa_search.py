@@ -0,0 +1,256 @@
+"""
+A game-tree search player for the Kaooa game.
+
+Iterative-deepening alpha-beta (negamax) over the packed positions of
+kaooa_engine, so it never touches the turtle while thinking. Every move is
+answered within a time budget with the best move of the deepest search that
+finished. The evaluation of the leaves is pluggable and the results of the
+searched positions are kept in a transposition table between moves.
+"""
+
+import time
+
+from kaooa_engine import (ALL_VERTICES, VULTURE_SHIFT, CAPTURED_SHIFT, VTURN,
+                          NO_VULTURE, NCROWS, MOVES, MOVE_DELTA, VULTURE_BIT,
+                          VULTURE_JUMPS, NEIGHBOR_MASK, legal_moves, winner)
+from kaooa_solver import WIN, LOSS
+from kaooa_tablebase import load_tablebase
+from kaooa_transposition import (EXACT, LOWER, UPPER, TranspositionTable,
+                                 zobrist_key, child_key)
+
+# the score of winning right now; a win in n plies scores MATE - n
+MATE = 100000
+# the score of a win known to a tablebase (less any distance-to-mate)
+TABLEBASE_WIN = MATE // 2
+INFINITY = MATE + 1
+MAX_DEPTH = 64
+
+# check the clock once every so many nodes
+CLOCK_INTERVAL = 256
+# scores beyond this are wins found by the search, which depend on the ply
+MATE_BOUND = MATE - MAX_DEPTH - 1
+
+
+class SearchTimeout(Exception):
+    """
+    raised inside the search when the time budget runs out
+    """
+
+
+def vulture_mobility(position):
+    """
+    the number of steps & jumps available to the vulture (whoever is to play)
+
+    Returns: the (steps, jumps) pair; (0, 0) if the vulture is not placed yet
+    """
+    vloc = position >> VULTURE_SHIFT & 15
+    if vloc == NO_VULTURE:
+        return 0, 0
+    crows = position & ALL_VERTICES
+    empty = ALL_VERTICES & ~(crows | VULTURE_BIT[vloc])
+    steps = bin(NEIGHBOR_MASK[vloc] & empty).count('1')
+    jumps = 0
+    for middle_bit, target_bit, _ in VULTURE_JUMPS[vloc]:
+        if crows & middle_bit and empty & target_bit:
+            jumps += 1
+    return steps, jumps
+
+
+def evaluate(position):
+    """
+    A heuristic score of a position for the side to play.
+
+    The crows like to keep their pieces and to cut the vulture's moves,
+    capture threats weigh the most.
+    """
+    captured = position >> CAPTURED_SHIFT & 7
+    steps, jumps = vulture_mobility(position)
+    score = 100 * (NCROWS - captured) - 10 * steps - 40 * jumps
+    return -score if position & VTURN else score
+
+
+def tablebase_evaluation(tablebase, fallback=evaluate):
+    """
+    make an evaluation with the exact results of a tablebase (or a kaooa_solver.Solution)
+
+    Positions unknown to the tablebase are scored by the fallback evaluation.
+    """
+    probe = tablebase.probe
+
+    def evaluate_exactly(position):
+        result, dtm = probe(position)
+        if result == WIN:
+            return TABLEBASE_WIN - dtm
+        if result == LOSS:
+            return dtm - TABLEBASE_WIN
+        if result:
+            # a draw
+            return 0
+        return fallback(position)
+
+    return evaluate_exactly
+
+
+def order_moves(position, moves):
+    """
+    sort the moves to search the most promising first:
+    captures, then the moves that leave the vulture with the fewest moves
+    (crows) or the most capture threats (vulture)
+    """
+    if position & VTURN:
+        def key(move):
+            if MOVES[move][2] >= 0:
+                return -100
+            _, jumps = vulture_mobility(position + MOVE_DELTA[move])
+            return -jumps
+    else:
+        def key(move):
+            steps, jumps = vulture_mobility(position + MOVE_DELTA[move])
+            return steps + 4 * jumps
+    return sorted(moves, key=key)
+
+
+def score_to_table(score, ply):
+    """
+    store the wins found by the search as the distance from the position itself
+    """
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_table(score, ply):
+    """
+    the inverse of score_to_table at the current ply
+    """
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class AlphaBetaPlayer:
+    """
+    Chooses a move by iterative-deepening alpha-beta within a time budget
+    """
+    def __init__(self, forced_jump=True, time_budget=0.05, max_depth=MAX_DEPTH,
+                 evaluate=evaluate, tt_size=1 << 16):
+        self.forced_jump = forced_jump
+        # seconds to think about a move (None: no clock, only max_depth)
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.evaluate = evaluate
+        # the entries are only valid for one set of rules & evaluation
+        self.tt = TranspositionTable(tt_size)
+        # statistics of the last search
+        self.nodes = 0
+        self.depth = 0
+        self.score = 0
+        self._deadline = 0.0
+
+    def choose_move(self, position):
+        """
+        search a position for the best move of the side to play
+
+        Returns: the move or None if the game is over
+        """
+        if winner(position) is not None:
+            return None
+        moves = order_moves(position, legal_moves(position, self.forced_jump))
+
+        self._deadline = float('inf')
+        if self.time_budget is not None:
+            self._deadline = time.perf_counter() + self.time_budget
+        self.nodes = 0
+        self.depth = 0
+        best = moves[0]
+        key = zobrist_key(position)
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self._search_root(position, key, moves, depth)
+            except SearchTimeout:
+                break
+            best, self.score, self.depth = move, score, depth
+            # search the best move first in the next iteration
+            moves.remove(move)
+            moves.insert(0, move)
+            # a forced win or loss can't change any more
+            if abs(score) >= MATE - MAX_DEPTH:
+                break
+        return best
+
+    def _search_root(self, position, key, moves, depth):
+        """
+        search all the moves at the root to the given depth
+        """
+        alpha = -INFINITY
+        best = moves[0]
+        for move in moves:
+            score = -self._search(position + MOVE_DELTA[move], child_key(key, position, move),
+                                  depth - 1, -INFINITY, -alpha, 1)
+            if score > alpha:
+                alpha, best = score, move
+        self.tt.store(key, depth, score_to_table(alpha, 0), EXACT, best)
+        return alpha, best
+
+    def _search(self, position, key, depth, alpha, beta, ply):
+        """
+        negamax alpha-beta; the score is from the view of the side to play
+        """
+        self.nodes += 1
+        if not self.nodes % CLOCK_INTERVAL and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        # every finished game is lost by the side to play
+        if winner(position) is not None:
+            return ply - MATE
+        if depth <= 0:
+            return self.evaluate(position)
+
+        entry = self.tt.probe(key)
+        if entry is not None:
+            _, entry_depth, score, bound, tt_move = entry
+            if entry_depth >= depth:
+                score = score_from_table(score, ply)
+                if bound == EXACT or (bound == LOWER and score >= beta) or \
+                        (bound == UPPER and score <= alpha):
+                    return score
+
+        moves = order_moves(position, legal_moves(position, self.forced_jump))
+        if entry is not None:
+            # search the best move found before first
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        alpha_orig = alpha
+        best, best_move = -INFINITY, moves[0]
+        for move in moves:
+            score = -self._search(position + MOVE_DELTA[move], child_key(key, position, move),
+                                  depth - 1, -beta, -alpha, ply + 1)
+            if score > best:
+                best, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best <= alpha_orig:
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.tt.store(key, depth, score_to_table(best, ply), bound, best_move)
+        return best
+
+
+def make_vulture_ai(forced_jump, think_time):
+    """
+    the computer vulture of the games: alpha-beta within think_time seconds,
+    scoring the positions from the tablebase (built on the first run)
+    """
+    return AlphaBetaPlayer(forced_jump, time_budget=think_time,
+                           evaluate=tablebase_evaluation(load_tablebase(forced_jump)))
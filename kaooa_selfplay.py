@@ -0,0 +1,155 @@
+"""
+Play many complete Kaooa games between computer players in parallel.
+
+The games are split into shards that run on a process pool; every shard has
+its own seeds (derived from --seed). Every game opens with a few random
+plies from the seed of its shard, so the deterministic players (alpha-beta
+& the tablebase) don't play the same game over & over. The results of a
+run don't depend on the number of workers as long as the players don't
+depend on the clock: random, tablebase & alpha-beta with --think-time 0
+(searching to --depth only). Every game is streamed to the output file as one line
+of the record format of kaooa_record: the winner, C (crows), V (vulture)
+or D (draw: still going on after the maximum number of plies), then the moves.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import os
+import random
+import time
+
+from kaooa_engine import (INITIAL_POSITION, MAX_PLIES, MOVE_DELTA, RandomPlayer,
+                          legal_moves, play_game, winner)
+from kaooa_record import RESULT_CODES, write_records
+
+PLAYERS = ('random', 'alphabeta', 'mcts', 'tablebase')
+
+
+class TablebasePlayer:
+    """
+    Plays the best move of the solved game
+    """
+    def __init__(self, forced_jump):
+        # imported here so the workers only load what they play
+        from kaooa_tablebase import load_tablebase
+        self.tablebase = load_tablebase(forced_jump)
+
+    def choose_move(self, position):
+        """
+        Returns: the best move known to the tablebase
+        """
+        return self.tablebase.best_move(position)
+
+
+def make_player(name, forced_jump, think_time, depth, seed):
+    """
+    create a player by its name in PLAYERS
+    """
+    if name == 'random':
+        return RandomPlayer(forced_jump, random.Random(seed))
+    if name == 'alphabeta':
+        from kaooa_search import AlphaBetaPlayer
+        return AlphaBetaPlayer(forced_jump, time_budget=think_time or None, max_depth=depth)
+    if name == 'mcts':
+        from kaooa_mcts import MCTSPlayer
+        return MCTSPlayer(forced_jump, time_budget=think_time, seed=seed)
+    if name == 'tablebase':
+        return TablebasePlayer(forced_jump)
+    raise ValueError(f"unknown player {name!r}")
+
+
+def random_opening(rng, forced_jump, plies):
+    """
+    play a few random plies from the start
+
+    Returns: the moves & the position after them
+    """
+    moves = []
+    position = INITIAL_POSITION
+    while len(moves) < plies and winner(position) is None:
+        move = rng.choice(legal_moves(position, forced_jump))
+        moves.append(move)
+        position += MOVE_DELTA[move]
+    return moves, position
+
+
+def play_shard(crows, vulture, forced_jump, ngames, seed, think_time, depth, max_plies,
+               opening_plies):
+    """
+    play a shard of games in a worker process
+
+    Returns: a list of (winner, moves) of every game
+    """
+    crows_player = make_player(crows, forced_jump, think_time, depth, seed)
+    vulture_player = make_player(vulture, forced_jump, think_time, depth, seed + 1)
+    opening_rng = random.Random(seed + 2)
+    games = []
+    for _ in range(ngames):
+        opening, position = random_opening(opening_rng, forced_jump, opening_plies)
+        result, moves = play_game(crows_player, vulture_player, max_plies - len(opening),
+                                  position)
+        games.append((result, opening + moves))
+    return games
+
+
+def main():
+    """
+    run the games on a process pool & report the win rates
+    """
+    parser = argparse.ArgumentParser(description="Play Kaooa games between computer players.")
+    parser.add_argument('--games', type=int, default=10000, help="the number of games")
+    parser.add_argument('--crows', choices=PLAYERS, default='random')
+    parser.add_argument('--vulture', choices=PLAYERS, default='random')
+    parser.add_argument('--optional-jump', action='store_true',
+                        help="the vulture may decline a jump (the rules of turt.py)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="the number of worker processes (default: all cores)")
+    parser.add_argument('--shard-size', type=int, default=250, help="games per task")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--think-time', type=int, default=5,
+                        help="milliseconds per move of the searching players (default: 5); "
+                        "0 lets alpha-beta search to --depth without a clock")
+    parser.add_argument('--depth', type=int, default=4,
+                        help="the maximum depth of the alpha-beta player (default: 4)")
+    parser.add_argument('--max-plies', type=int, default=MAX_PLIES,
+                        help="a game still going on after so many plies is a draw")
+    parser.add_argument('--opening-plies', type=int, default=4,
+                        help="random plies opening every game (default: 4)")
+    parser.add_argument('--output', default='selfplay.txt',
+                        help="the file the game records are appended to")
+    args = parser.parse_args()
+    if not args.think_time and 'mcts' in (args.crows, args.vulture):
+        parser.error("the mcts player needs a --think-time")
+
+    forced_jump = not args.optional_jump
+    shards = []
+    for start in range(0, args.games, args.shard_size):
+        ngames = min(args.shard_size, args.games - start)
+        # every shard gets three seeds of its own (one per player & the openings)
+        seed = args.seed + 3 * len(shards)
+        shards.append((args.crows, args.vulture, forced_jump, ngames, seed,
+                       args.think_time / 1000, args.depth, args.max_plies,
+                       args.opening_plies))
+
+    counts = dict.fromkeys(RESULT_CODES, 0)
+    begin = time.perf_counter()
+    with open(args.output, 'a', encoding='utf-8') as output, \
+            ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(play_shard, *shard) for shard in shards]
+        for future in as_completed(futures):
+            games = future.result()
+            for winner, _ in games:
+                counts[winner] += 1
+            write_records(output, games)
+    elapsed = time.perf_counter() - begin
+
+    rules = 'forced' if forced_jump else 'optional'
+    print(f"{args.crows} crows vs {args.vulture} vulture, {rules} jumps: "
+          f"{args.games} games in {elapsed:.2f}s ({args.games / elapsed:.0f} games/sec)")
+    for winner, count in counts.items():
+        name = winner or 'draws'
+        print(f"  {name}: {count} ({100 * count / args.games:.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""
+Retrograde analysis of the Kaooa game.
+
+Every position reachable from the start is enumerated and labeled as a win,
+a loss or a draw for the side to play, along with the number of plies to the
+end of the game under perfect play (distance-to-mate). Both the compulsory
+jump rules of kaooa.py and the optional jump rules of turt.py are supported.
+
+Positions are stored in flat arrays indexed by position_index, a perfect hash
+of the (vulture, crows, captured, side to play) fields; the crows in hand
+follow from them.
+"""
+
+from collections import deque
+import argparse
+import time
+
+from kaooa_engine import (INITIAL_POSITION, MOVE_DELTA, NCROWS, NO_VULTURE,
+                          ALL_VERTICES, VULTURE_SHIFT, CAPTURED_SHIFT,
+                          VTURN, legal_moves, winner, pack_position)
+
+# the result of a position for the side to play (0 if the position is unreachable)
+UNKNOWN = 0
+WIN = 1
+LOSS = 2
+DRAW = 3
+
+RESULT_NAMES = {UNKNOWN: 'unknown', WIN: 'win', LOSS: 'loss', DRAW: 'draw'}
+
+# the number of values of each field in the perfect hash
+NVULTURE = NO_VULTURE + 1
+NCAPTURED = 5
+NPOSITIONS = NVULTURE * (ALL_VERTICES + 1) * NCAPTURED * 2
+
+
+def position_index(position):
+    """
+    the perfect hash of a packed position in range(NPOSITIONS)
+    """
+    vloc = position >> VULTURE_SHIFT & 15
+    captured = position >> CAPTURED_SHIFT & 7
+    return ((vloc << 10 | position & ALL_VERTICES) * NCAPTURED + captured) * 2 + \
+        (1 if position & VTURN else 0)
+
+
+def index_position(index):
+    """
+    the packed position of a perfect hash, or None if no position has that index
+    """
+    index, vturn = divmod(index, 2)
+    index, captured = divmod(index, NCAPTURED)
+    vloc, crows = divmod(index, ALL_VERTICES + 1)
+    in_hand = NCROWS - bin(crows).count('1') - captured
+    if in_hand < 0 or (vloc != NO_VULTURE and crows >> vloc & 1):
+        return None
+    return pack_position(crows, vloc, in_hand, captured, vturn)
+
+
+class Solution:
+    """
+    The result & distance-to-mate of every position for a set of rules
+    """
+    def __init__(self, forced_jump, results, dtms):
+        self.forced_jump = forced_jump
+        self.results = results
+        self.dtms = dtms
+
+    def probe(self, position):
+        """
+        Returns: the (result, distance-to-mate) of a position for the side to play
+        """
+        index = position_index(position)
+        return self.results[index], self.dtms[index]
+
+    def best_move(self, position):
+        """
+        the move with the best result for the side to play
+        """
+        return best_move(self.probe, position, self.forced_jump)
+
+
+def best_move(probe, position, forced_jump):
+    """
+    choose the move with the best result using a probe(position) -> (result, dtm)
+
+    A win is taken by the fastest route, a loss is delayed as long as possible
+    and a draw is kept a draw.
+
+    Returns: the move or None if the game is over
+    """
+    if winner(position) is not None:
+        return None
+
+    best, best_key = None, None
+    for move in legal_moves(position, forced_jump):
+        result, dtm = probe(position + MOVE_DELTA[move])
+        # the results of the child are from the opponent's side
+        if result == LOSS:
+            key = (2, -dtm)
+        elif result == WIN:
+            key = (0, dtm)
+        else:
+            key = (1, 0)
+        if best_key is None or key > best_key:
+            best, best_key = move, key
+    return best
+
+
+def solve(forced_jump=True):
+    """
+    label every position reachable from the start by retrograde analysis
+
+    Returns: a Solution of the rules
+    """
+    results = bytearray(NPOSITIONS)
+    dtms = bytearray(NPOSITIONS)
+    # the number of successors not yet known to be a win for the opponent
+    remaining = [0] * NPOSITIONS
+    parents = {}
+
+    # enumerate all the reachable positions from the start
+    seen = bytearray(NPOSITIONS)
+    seen[position_index(INITIAL_POSITION)] = 1
+    frontier = [INITIAL_POSITION]
+    queue = deque()
+    while frontier:
+        next_frontier = []
+        for position in frontier:
+            index = position_index(position)
+            if winner(position) is not None:
+                # the side to play has lost
+                results[index] = LOSS
+                queue.append(index)
+                continue
+            moves = legal_moves(position, forced_jump)
+            remaining[index] = len(moves)
+            for move in moves:
+                child = position + MOVE_DELTA[move]
+                child_index = position_index(child)
+                parents.setdefault(child_index, []).append(index)
+                if not seen[child_index]:
+                    seen[child_index] = 1
+                    next_frontier.append(child)
+        frontier = next_frontier
+
+    # walk back from the finished games in the order of distance-to-mate
+    while queue:
+        index = queue.popleft()
+        lost = results[index] == LOSS
+        dtm = min(dtms[index] + 1, 255)
+        for parent in parents.get(index, ()):
+            if results[parent]:
+                continue
+            if lost:
+                # a move to a lost position wins
+                results[parent] = WIN
+            else:
+                remaining[parent] -= 1
+                if remaining[parent]:
+                    continue
+                # every move leads to a win for the opponent
+                results[parent] = LOSS
+            dtms[parent] = dtm
+            queue.append(parent)
+
+    # the rest can be played forever
+    for index in range(NPOSITIONS):
+        if seen[index] and not results[index]:
+            results[index] = DRAW
+
+    return Solution(forced_jump, results, dtms)
+
+
+def summarize(solution):
+    """
+    count the results of the reachable positions
+    """
+    counts = dict.fromkeys((WIN, LOSS, DRAW), 0)
+    for result in solution.results:
+        if result:
+            counts[result] += 1
+    return counts
+
+
+def main():
+    """
+    solve the game & print the result of the initial position
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--optional-jump', action='store_true',
+                        help="the vulture may decline a jump (the rules of turt.py)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    solution = solve(forced_jump=not args.optional_jump)
+    elapsed = time.perf_counter() - start
+
+    counts = summarize(solution)
+    result, dtm = solution.probe(INITIAL_POSITION)
+    print(f"solved {sum(counts.values())} positions in {elapsed:.2f}s")
+    print(", ".join(f"{RESULT_NAMES[r]}: {n}" for r, n in counts.items()))
+    print(f"initial position: {RESULT_NAMES[result]} for the crows in {dtm} plies")
+
+
+if __name__ == '__main__':
+    main()
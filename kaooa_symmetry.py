@@ -0,0 +1,138 @@
+"""
+The symmetries of the Kaooa star & the canonical form of a position.
+
+The star has the symmetries of a pentagon: 5 rotations, each with or
+without a reflection. Every one of them maps the corners 0-4 onto the
+corners & the inner vertices 5-9 onto the inner vertices, keeping all the
+adjacencies & the jumps of kaooa_tables, so two positions that map onto
+each other have the same result & mirrored best moves. A solver, a
+transposition table or an opening book can keep one entry per class of
+symmetric positions, up to 10 times fewer.
+
+The symmetries are applied with lookup tables built once at import: the
+image of every crow mask, of every vertex of the vulture & of every move.
+"""
+
+import argparse
+
+from kaooa_engine import ALL_VERTICES, VULTURE_SHIFT, NO_VULTURE, MOVES, MOVE_PIECE
+
+# one step around the star (0 -> 1 -> 2 -> 3 -> 4 along its lines) & its
+# mirror image through the vertices 0 & 9, as the image of every vertex
+ROTATION = (1, 2, 3, 4, 0, 7, 8, 9, 5, 6)
+REFLECTION = (0, 4, 3, 2, 1, 8, 7, 6, 5, 9)
+
+
+def _symmetries():
+    """
+    all the rotations (the identity first), then all the reflected rotations
+    """
+    symmetries = [tuple(range(10))]
+    for _ in range(4):
+        symmetries.append(tuple(ROTATION[v] for v in symmetries[-1]))
+    return tuple(symmetries + [tuple(REFLECTION[v] for v in symmetry)
+                               for symmetry in symmetries])
+
+
+# the image of every vertex under every symmetry
+SYMMETRIES = _symmetries()
+NSYMMETRIES = len(SYMMETRIES)
+
+# the symmetry undoing every symmetry
+INVERSES = tuple(SYMMETRIES.index(tuple(symmetry.index(v) for v in range(10)))
+                 for symmetry in SYMMETRIES)
+
+
+def _mask_images(symmetry):
+    """
+    the image of every crow mask under a symmetry, each mask extending
+    the one without its highest vertex
+    """
+    images = [0]
+    for mask in range(1, ALL_VERTICES + 1):
+        highest = mask.bit_length() - 1
+        images.append(images[mask ^ (1 << highest)] | 1 << symmetry[highest])
+    return tuple(images)
+
+
+def _move_images(symmetry):
+    """
+    the image of every move under a symmetry
+    """
+    index = {(MOVES[move], MOVE_PIECE[move]): move for move in range(len(MOVES))}
+    images = []
+    for move, (src, dst, over) in enumerate(MOVES):
+        image = tuple(symmetry[v] if v >= 0 else v for v in (src, dst, over))
+        images.append(index[image, MOVE_PIECE[move]])
+    return tuple(images)
+
+
+MASK_IMAGES = tuple(_mask_images(symmetry) for symmetry in SYMMETRIES)
+# the image of the vulture's field of the position (NO_VULTURE stays)
+VULTURE_IMAGES = tuple(symmetry + (NO_VULTURE,) for symmetry in SYMMETRIES)
+MOVE_IMAGES = tuple(_move_images(symmetry) for symmetry in SYMMETRIES)
+
+# the fields of a position other than the crows & the vulture
+_OTHER_FIELDS = ~(ALL_VERTICES | 15 << VULTURE_SHIFT)
+
+
+def transform(position, symmetry):
+    """
+    the image of a packed position under the symmetry with that index
+    """
+    vloc = position >> VULTURE_SHIFT & 15
+    return (position & _OTHER_FIELDS | MASK_IMAGES[symmetry][position & ALL_VERTICES] |
+            VULTURE_IMAGES[symmetry][vloc] << VULTURE_SHIFT)
+
+
+def canonical(position):
+    """
+    the representative of the class of a position: its smallest image
+
+    Returns: the (canonical position, symmetry) where transform(position, symmetry)
+    is the canonical position; a move m of the canonical position is the move
+    MOVE_IMAGES[INVERSES[symmetry]][m] of the position
+    """
+    crows = position & ALL_VERTICES
+    vloc = position >> VULTURE_SHIFT & 15
+    others = position & _OTHER_FIELDS
+    best, best_symmetry = position, 0
+    for symmetry in range(1, NSYMMETRIES):
+        image = (others | MASK_IMAGES[symmetry][crows] |
+                 VULTURE_IMAGES[symmetry][vloc] << VULTURE_SHIFT)
+        if image < best:
+            best, best_symmetry = image, symmetry
+    return best, best_symmetry
+
+
+def main():
+    """
+    solve the game & count its classes of symmetric positions, checking that
+    symmetric positions have the same result
+    """
+    # imported here as only the check needs the solver
+    from kaooa_solver import index_position, solve
+
+    parser = argparse.ArgumentParser(description="Count the symmetric Kaooa positions.")
+    parser.add_argument('--optional-jump', action='store_true',
+                        help="the vulture may decline a jump (the rules of turt.py)")
+    args = parser.parse_args()
+
+    solution = solve(forced_jump=not args.optional_jump)
+    positions = 0
+    classes = set()
+    for index, result in enumerate(solution.results):
+        if not result:
+            continue
+        position = index_position(index)
+        positions += 1
+        classes.add(canonical(position)[0])
+        for symmetry in range(NSYMMETRIES):
+            if solution.probe(transform(position, symmetry)) != (result, solution.dtms[index]):
+                parser.error(f"symmetry {symmetry} changes the result of {position:#x}")
+    print(f"{positions} reachable positions in {len(classes)} classes "
+          f"({positions / len(classes):.2f}x fewer), all symmetric positions agree")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+A compact on-disk tablebase of the solved Kaooa game.
+
+The file holds a small header followed by two dense sections indexed by the
+perfect hash of kaooa_solver.position_index:
+    the result of every position in 2 bits (4 positions per byte)
+    the distance-to-mate of every position in a byte
+It is loaded with mmap, so every process probing the same file shares the
+same pages and nothing is read until it is probed.
+"""
+
+import argparse
+import mmap
+import os
+
+from kaooa_solver import NPOSITIONS, position_index, best_move, solve
+
+MAGIC = b'KTB1'
+HEADER_SIZE = 8
+RESULTS_SIZE = NPOSITIONS // 4
+DTM_OFFSET = HEADER_SIZE + RESULTS_SIZE
+FILE_SIZE = DTM_OFFSET + NPOSITIONS
+
+# the tablebases are kept next to this file by default
+DEFAULT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def default_path(forced_jump):
+    """
+    the default file of the tablebase of a set of rules
+    """
+    name = 'kaooa_forced.tb' if forced_jump else 'kaooa_optional.tb'
+    return os.path.join(DEFAULT_DIR, name)
+
+
+def write_tablebase(solution, path):
+    """
+    write a kaooa_solver.Solution into a tablebase file
+    """
+    header = MAGIC + bytes([1 if solution.forced_jump else 0]) + bytes(HEADER_SIZE - 5)
+    results = bytearray(RESULTS_SIZE)
+    for index, result in enumerate(solution.results):
+        if result:
+            results[index >> 2] |= result << ((index & 3) << 1)
+
+    # write to a temporary file first so a reader never maps a partial file
+    # (& concurrent writers don't clash)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(results)
+        f.write(solution.dtms)
+    os.replace(tmp_path, path)
+
+
+class Tablebase:
+    """
+    A memory-mapped tablebase with O(1) probes
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) != FILE_SIZE or self._map[:4] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a Kaooa tablebase")
+        self.forced_jump = bool(self._map[4])
+
+    def probe(self, position):
+        """
+        Returns: the (result, distance-to-mate) of a position for the side to play
+        """
+        index = position_index(position)
+        result = self._map[HEADER_SIZE + (index >> 2)] >> ((index & 3) << 1) & 3
+        return result, self._map[DTM_OFFSET + index]
+
+    def best_move(self, position):
+        """
+        the move with the best result for the side to play
+        """
+        return best_move(self.probe, position, self.forced_jump)
+
+    def close(self):
+        """
+        unmap the file
+        """
+        self._map.close()
+
+
+def load_tablebase(forced_jump, path=None):
+    """
+    open the tablebase of a set of rules, solving & saving it first if it is missing
+
+    Returns: a Tablebase, or the in-memory solution if the file can't be written
+    """
+    if path is None:
+        path = default_path(forced_jump)
+    if not os.path.exists(path):
+        solution = solve(forced_jump)
+        try:
+            write_tablebase(solution, path)
+        except OSError:
+            return solution
+    return Tablebase(path)
+
+
+def main():
+    """
+    solve the game & write the tablebases of both sets of rules
+    """
+    parser = argparse.ArgumentParser(description="Write the Kaooa tablebases.")
+    parser.add_argument('--dir', default=DEFAULT_DIR,
+                        help="the directory to write the tablebases to")
+    args = parser.parse_args()
+
+    for forced_jump in (True, False):
+        path = os.path.join(args.dir, os.path.basename(default_path(forced_jump)))
+        write_tablebase(solve(forced_jump), path)
+        print(f"wrote {path}")
+
+
+if __name__ == '__main__':
+    main()
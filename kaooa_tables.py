@@ -0,0 +1,46 @@
+"""
+The connectivity of the 10 vertices of the Kaooa star, computed once at import.
+
+The outer (corner) vertices are 0-4 and the inner ones are 5-9, numbered as in
+kaooa_geometry.star_coordinates. The tables are shared by all the game
+implementations, so no game instance builds its own copy.
+"""
+
+# the adjacency matrix of the vertices of the star
+ADJ = (
+    (0, 0, 0, 0, 0, 0, 1, 1, 0, 0),
+    (0, 0, 0, 0, 0, 0, 0, 0, 1, 1),
+    (0, 0, 0, 0, 0, 1, 1, 0, 0, 0),
+    (0, 0, 0, 0, 0, 0, 0, 1, 1, 0),
+    (0, 0, 0, 0, 0, 1, 0, 0, 0, 1),
+    (0, 0, 1, 0, 1, 0, 1, 0, 0, 1),
+    (1, 0, 1, 0, 0, 1, 0, 1, 0, 0),
+    (1, 0, 0, 1, 0, 0, 1, 0, 1, 0),
+    (0, 1, 0, 1, 0, 0, 0, 1, 0, 1),
+    (0, 1, 0, 0, 1, 1, 0, 0, 1, 0),
+)
+
+# the jump over positions (x,y) from index i -
+# mean the vulture can jump from i to y through x.
+JUMP = (
+    ((7,8), (6,5)),
+    ((8,7), (9,5)),
+    ((6,7), (5,9)),
+    ((7,6), (8,9)),
+    ((5,6), (9,8)),
+    ((9,1), (6,0)),
+    ((5,4), (7,3)),
+    ((6,2), (8,1)),
+    ((9,4), (7,0)),
+    ((8,3), (5,2)),
+)
+
+# the vertices next to each vertex
+NEIGHBORS = tuple(tuple(loc for loc, val in enumerate(row) if val) for row in ADJ)
+
+# the same as a bitmask (bit i is set if vertex i is a neighbor)
+NEIGHBOR_MASK = tuple(sum(1 << loc for loc in row) for row in NEIGHBORS)
+
+# the (middle, target) of every jump from each vertex as bitmasks
+JUMP_MASKS = tuple(tuple((1 << middle, 1 << target) for middle, target in row)
+                   for row in JUMP)
@@ -0,0 +1,141 @@
+"""
+Zobrist hashing & a transposition table for searching Kaooa positions.
+
+Once all the crows are placed, the same positions come back again & again
+(crows shuffle back & forth, the vulture oscillates), so a search remembers
+what it found about every position by its Zobrist key.
+"""
+
+import random
+
+from kaooa_engine import (MOVES, MOVE_PIECE, CROW, NO_VULTURE, ALL_VERTICES,
+                          VULTURE_SHIFT, CAPTURED_SHIFT, VTURN, CAPTURES_TO_WIN)
+
+# the kinds of score bounds stored in the table
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+def _build_keys():
+    """
+    random 64-bit keys of every feature of a position, with a fixed seed
+    """
+    rng = random.Random(0x6B616F6F61)
+    crow_keys = tuple(rng.getrandbits(64) for _ in range(10))
+    # the vulture not being placed yet has no key
+    vulture_keys = tuple(rng.getrandbits(64) for _ in range(10)) + (0,)
+    captured_keys = (0,) + tuple(rng.getrandbits(64) for _ in range(CAPTURES_TO_WIN))
+    vturn_key = rng.getrandbits(64)
+    return crow_keys, vulture_keys, captured_keys, vturn_key
+
+
+CROW_KEYS, VULTURE_KEYS, CAPTURED_KEYS, VTURN_KEY = _build_keys()
+
+
+def _build_move_keys():
+    """
+    the change of the key by every move (the captured count changes separately)
+    """
+    keys = []
+    for move, (src, dst, over) in enumerate(MOVES):
+        if MOVE_PIECE[move] == CROW:
+            key = CROW_KEYS[dst] ^ (CROW_KEYS[src] if src >= 0 else 0)
+        else:
+            key = VULTURE_KEYS[dst] ^ VULTURE_KEYS[src if src >= 0 else NO_VULTURE]
+            if over >= 0:
+                key ^= CROW_KEYS[over]
+        keys.append(key ^ VTURN_KEY)
+    return tuple(keys)
+
+
+MOVE_KEYS = _build_move_keys()
+
+# the change of the key when the captured count goes up from n
+CAPTURE_KEYS = tuple(CAPTURED_KEYS[n] ^ CAPTURED_KEYS[n + 1] for n in range(CAPTURES_TO_WIN))
+
+
+def zobrist_key(position):
+    """
+    the Zobrist key of a packed position computed from scratch
+    """
+    key = CAPTURED_KEYS[position >> CAPTURED_SHIFT & 7]
+    key ^= VULTURE_KEYS[position >> VULTURE_SHIFT & 15]
+    crows = position & ALL_VERTICES
+    for loc in range(10):
+        if crows >> loc & 1:
+            key ^= CROW_KEYS[loc]
+    if position & VTURN:
+        key ^= VTURN_KEY
+    return key
+
+
+def child_key(key, position, move):
+    """
+    the Zobrist key after playing a move, updated incrementally
+    """
+    key ^= MOVE_KEYS[move]
+    if MOVES[move][2] >= 0:
+        key ^= CAPTURE_KEYS[position >> CAPTURED_SHIFT & 7]
+    return key
+
+
+class TranspositionTable:
+    """
+    A fixed-size table of search results with buckets of two entries:
+    the first keeps the deepest search of the positions hashed there and
+    the second always takes the latest one.
+
+    An entry is a tuple (key, depth, score, bound, move).
+    """
+    def __init__(self, size=1 << 16):
+        # the number of buckets is rounded down to a power of two
+        nbuckets = 1 << max(size.bit_length() - 1, 0)
+        self._mask = nbuckets - 1
+        self._entries = [None] * (2 * nbuckets)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def probe(self, key):
+        """
+        Returns: the entry stored for a key or None
+        """
+        slot = (key & self._mask) << 1
+        entry = self._entries[slot]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = self._entries[slot + 1]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        """
+        remember the result of a search of a position
+        """
+        self.stores += 1
+        slot = (key & self._mask) << 1
+        deepest = self._entries[slot]
+        if deepest is None or deepest[0] == key or depth >= deepest[1]:
+            self._entries[slot] = (key, depth, score, bound, move)
+        else:
+            self._entries[slot + 1] = (key, depth, score, bound, move)
+
+    def clear(self):
+        """
+        forget all the entries & reset the counters
+        """
+        self._entries = [None] * len(self._entries)
+        self.hits = self.misses = self.stores = 0
+
+    def stats(self):
+        """
+        Returns: a dict of the hit/miss counters
+        """
+        probes = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'stores': self.stores,
+                'hit_rate': self.hits / probes if probes else 0.0}
@@ -3,6 +3,11 @@ import time
 import math
 import random
 
+from kaooa_tables import NEIGHBORS, NEIGHBOR_MASK, JUMP
+from kaooa_engine import MOVES, state_position
+from kaooa_tablebase import load_tablebase
+from kaooa_search import AlphaBetaPlayer, tablebase_evaluation
+
 def find_intersection_point(p1, p2, p3, p4):
 	"""
 	find the point of intersection of two lines defined by l1=(p1,p2) and l2=(p3,p4)
@@ -121,34 +126,11 @@ class Kaooa(Turtle):
 		# get the coordinates of the 10 vertices of the Star
 		self.coords = get_star_coordinates(400)
 
-		# the adjacency matrix of the vertices of the star
-		self.adj = [
-			[0, 0, 0, 0, 0, 0, 1, 1, 0, 0],
-			[0, 0, 0, 0, 0, 0, 0, 0, 1, 1],
-			[0, 0, 0, 0, 0, 1, 1, 0, 0, 0],
-			[0, 0, 0, 0, 0, 0, 0, 1, 1, 0],
-			[0, 0, 0, 0, 0, 1, 0, 0, 0, 1],
-			[0, 0, 1, 0, 1, 0, 1, 0, 0, 1],
-			[1, 0, 1, 0, 0, 1, 0, 1, 0, 0],
-			[1, 0, 0, 1, 0, 0, 1, 0, 1, 0],
-			[0, 1, 0, 1, 0, 0, 0, 1, 0, 1],
-			[0, 1, 0, 0, 1, 1, 0, 0, 1, 0]
-		]
-
-		# the jump over positions (x,y) from index i -
-		# mean the vulture can jump from i to y through x.
-		self.jump = [
-			[(7,8), (6,5)],
-			[(8,7), (9,5)],
-			[(6,7), (5,9)],
-			[(7,6), (8,9)],
-			[(5,6), (9,8)],
-			[(9,1), (6,0)],
-			[(5,4), (7,3)],
-			[(6,2), (8,1)],
-			[(9,4), (7,0)],
-			[(8,3), (5,2)],
-		]
+		# the solved game (the vulture may decline a jump here) scores the
+		# leaves of the search that picks the crows' moves within 50 ms
+		self.tablebase = load_tablebase(forced_jump=False)
+		self.player = AlphaBetaPlayer(forced_jump=False, time_budget=0.05,
+			evaluate=tablebase_evaluation(self.tablebase))
 
 		# choose a location randomly and place a crow there
 		loc = random.randint(0, 9)
@@ -287,12 +269,18 @@ class Kaooa(Turtle):
 
 		self.show_crow_status()
 
+	def position(self):
+		"""
+		the packed position of the game with the crows to play
+		"""
+		return state_position(self.state, self.captured, False)
+
 	def place_crow(self):
 		"""
-		place a crow randomly in an empty location
+		place a crow in the empty location chosen by the search
 		"""
-		empty_locs = [i for i in range(len(self.state)) if self.state[i] == '']
-		new_cloc = random.choice(empty_locs)
+		move = self.player.choose_move(self.position())
+		new_cloc = MOVES[move][1]
 		# place the crow there
 		self.state[new_cloc] = 'crow'
 		self.color_dot_blue(self.coords[new_cloc])
@@ -301,35 +289,29 @@ class Kaooa(Turtle):
 
 	def move_crow(self):
 		"""
-		move a crow from a random location to a nearby empty location
+		move the crow chosen by the search to a nearby empty location
 		"""
-		crow_locs = [i for i in range(len(self.state)) if self.state[i] == 'crow']
-		# shuffle the crow locations for randomness
-		random.shuffle(crow_locs)
-
-		for cloc in crow_locs:
-			# check if there is an empty nearby location to move to			
-			for adj_loc, val in enumerate(self.adj[cloc]):
-				if val == 0: continue
-				if self.state[adj_loc] != '': continue
-				# otherwise move the crow there
-				self.state[cloc] = ''
-				self.erase_dot(self.coords[cloc])
-				self.state[adj_loc] = 'crow'
-				self.color_dot_blue(self.coords[adj_loc])
-				return
+		move = self.player.choose_move(self.position())
+		# no crow has an empty nearby location to move to
+		if move is None:
+			return
+		cloc, adj_loc, _ = MOVES[move]
+		self.state[cloc] = ''
+		self.erase_dot(self.coords[cloc])
+		self.state[adj_loc] = 'crow'
+		self.color_dot_blue(self.coords[adj_loc])
 
 	def check_any_move_possible(self, vloc):
 		"""
 		check if any move possible for the vulture at location vloc
 		"""
 		# check if any nearby move possible
-		for loc, val in enumerate(self.adj[vloc]):
-			if val and self.state[loc] == '':
+		for loc in NEIGHBORS[vloc]:
+			if self.state[loc] == '':
 				return True
 
 		# check for any jump-over locations possible
-		for middle, target in self.jump[vloc]:
+		for middle, target in JUMP[vloc]:
 			if self.state[target] == '':
 				return True
 
@@ -382,7 +364,7 @@ class Kaooa(Turtle):
 		prev_vloc = self.state.index('vulture')
 		# the clicked location has to be either nearby or a jump-over location
 		# check if clicking on a nearby location
-		if self.adj[prev_vloc][nearest_vertext]:
+		if NEIGHBOR_MASK[prev_vloc] >> nearest_vertext & 1:
 			# move the vulture there
 			self.state[prev_vloc] = ''
 			self.erase_dot(self.coords[prev_vloc])
@@ -393,7 +375,7 @@ class Kaooa(Turtle):
 			return
 
 		# check if vulture is jumping over a crow
-		for new_vloc in self.jump[prev_vloc]:
+		for new_vloc in JUMP[prev_vloc]:
 			# the middle vertex should have a crow to jump-over
 			if nearest_vertext != new_vloc[1] or self.state[new_vloc[0]] != 'crow':
 				continue
@@ -435,9 +417,15 @@ class Kaooa(Turtle):
 		# wait for the user to click on an empty circle's vicinity
 		self.screen.onclick(self.user_clicked)
 		print("Game ended!")
-		
 
 
-game = Kaooa()
+def main():
+	"""
+	open the game window & wait for the user to quit
+	"""
+	Kaooa()
+	input("Press Enter to Quit. ")
+
 
-input("Press Enter to Quit. ")
\ No newline at end of file
+if __name__ == '__main__':
+	main()
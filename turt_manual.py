@@ -513,8 +513,15 @@ class Kaooa(Turtle):
 		# listener for user clicks on an empty circle's vicinity
 		self.screen.onclick(self.user_clicked)
 		# print("Game ended!")
-		
 
 
-game = Kaooa()
-input("Press Enter to Quit. ")
\ No newline at end of file
+def main():
+	"""
+	open the game window & wait for the user to quit
+	"""
+	Kaooa()
+	input("Press Enter to Quit. ")
+
+
+if __name__ == '__main__':
+	main()
@@ -5,6 +5,8 @@ from turtle import Turtle
 import time
 import math
 
+from kaooa_tables import NEIGHBORS, NEIGHBOR_MASK, JUMP
+
 def find_intersection_point(p1, p2, p3, p4):
     """
     find the point of intersection of two lines defined by l1=(p1,p2) and l2=(p3,p4)
@@ -132,35 +134,6 @@ class Kaooa(Turtle):
         # get the coordinates of the 10 vertices of the Star
         self.coords = get_star_coordinates(400)
 
-        # the adjacency matrix of the vertices of the star
-        self.adj = [
-            [0, 0, 0, 0, 0, 0, 1, 1, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 1, 1],
-            [0, 0, 0, 0, 0, 1, 1, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0, 0, 1, 1, 0],
-            [0, 0, 0, 0, 0, 1, 0, 0, 0, 1],
-            [0, 0, 1, 0, 1, 0, 1, 0, 0, 1],
-            [1, 0, 1, 0, 0, 1, 0, 1, 0, 0],
-            [1, 0, 0, 1, 0, 0, 1, 0, 1, 0],
-            [0, 1, 0, 1, 0, 0, 0, 1, 0, 1],
-            [0, 1, 0, 0, 1, 1, 0, 0, 1, 0]
-        ]
-
-        # the jump over positions (x,y) from index i -
-        # mean the vulture can jump from i to y through x.
-        self.jump = [
-            [(7,8), (6,5)],
-            [(8,7), (9,5)],
-            [(6,7), (5,9)],
-            [(7,6), (8,9)],
-            [(5,6), (9,8)],
-            [(9,1), (6,0)],
-            [(5,4), (7,3)],
-            [(6,2), (8,1)],
-            [(9,4), (7,0)],
-            [(8,3), (5,2)],
-        ]
-
         # render the initial state
         self.render_state()
         self.play_game()
@@ -371,12 +344,12 @@ class Kaooa(Turtle):
         check if any move possible for the vulture at location vloc
         """
         # check if any nearby move possible
-        for loc, val in enumerate(self.adj[vloc]):
-            if val and self.state[loc] == '':
+        for loc in NEIGHBORS[vloc]:
+            if self.state[loc] == '':
                 return True
 
         # check for any jump-over locations possible
-        for _, target in self.jump[vloc]:
+        for _, target in JUMP[vloc]:
             if self.state[target] == '':
                 return True
 
@@ -408,7 +381,7 @@ class Kaooa(Turtle):
         A function to check if vulture can jump over a crow.
         """
         # check if vulture is jumping over a crow
-        for middle, target in self.jump[prev_vertex]:
+        for middle, target in JUMP[prev_vertex]:
             # the middle vertex should have a crow to jump-over
             if selected_vertex != target or self.state[middle] != 'crow':
                 continue
@@ -432,7 +405,7 @@ class Kaooa(Turtle):
         prev_vertex = self.state.index('vulture')
         # the clicked location has to be either nearby or a jump-over location
         # check if clicking on a nearby vertex
-        if self.adj[prev_vertex][selected_vertex]:
+        if NEIGHBOR_MASK[prev_vertex] >> selected_vertex & 1:
             self._move_vulture(prev_vertex, selected_vertex)
             return
 
@@ -510,7 +483,7 @@ class Kaooa(Turtle):
             self._lock_crow_vertex(selected_vertex)
         else:
             # move only if the selected vertex is adjacent to the locked vertex
-            if self.adj[self.locked_vertex][selected_vertex]:
+            if NEIGHBOR_MASK[self.locked_vertex] >> selected_vertex & 1:
                 self._move_a_crow(self.locked_vertex, selected_vertex)
                 # remove any lock
                 self.locked_vertex = -1
@@ -571,6 +544,13 @@ class Kaooa(Turtle):
         # print("Game ended!")
 
 
+def main():
+    """
+    open the game window & wait for the user to quit
+    """
+    Kaooa()
+    input("Press Enter to Quit. ")
+
 
-game = Kaooa()
-input("Press Enter to Quit. ")
+if __name__ == '__main__':
+    main()